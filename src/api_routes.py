@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+from src import json_utils
 from src.job_models import JobStatus, Job
 from src.logger import get_logger
 from src.job_queue import JobQueue
@@ -262,7 +263,7 @@ def get_job_manager() -> JobManager:
 def handle_api_request(handler, path: str, method: str) -> tuple:
     """处理 API 请求"""
     job_manager = get_job_manager()
-    start_time = time.time()
+    start_time = time.monotonic()
     try:
         if path.startswith("/api/generate") and method == "POST":
             result = handle_generate(handler, job_manager)
@@ -297,7 +298,7 @@ def handle_api_request(handler, path: str, method: str) -> tuple:
         else:
             result = (404, {"error": "Not found"}, "application/json")
         if not path.startswith("/api/progress/"):
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.monotonic() - start_time) * 1000
             logger.log_api_request(method, path, result[0], duration_ms)
         return result
     except Exception as e:
@@ -311,8 +312,7 @@ def handle_generate(handler, job_manager: JobManager) -> tuple:
         content_length = int(handler.headers.get("Content-Length", 0))
         if content_length == 0:
             return 400, {"error": "Empty request body"}, "application/json"
-        post_data = handler.rfile.read(content_length).decode("utf-8")
-        data = json.loads(post_data)
+        data = json_utils.loads(handler.rfile.read(content_length))
         url = data.get("url", "").strip()
         user_id = data.get("user_id", "default").strip()
         prompt_text = data.get("prompt_text", "").strip()
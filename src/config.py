@@ -75,6 +75,17 @@ class Config:
             'speed': tts.get('speed', 1.0)
         }
     
+    def get_tts_cache_config(self) -> Dict[str, Any]:
+        """获取 TTS 缓存配置"""
+        cache = self.get('tts', {}).get('cache') or {}
+        
+        return {
+            'enabled': cache.get('enabled', False),
+            'cache_dir': cache.get('cache_dir', '~/.cache/ghostradio/tts'),
+            'memory_mb': cache.get('memory_mb', 8),
+            'max_disk_mb': cache.get('max_disk_mb', 100)
+        }
+    
     def get_resources_config(self) -> Dict[str, Any]:
         """获取资源限制配置"""
         resources = self.get('resources', {})
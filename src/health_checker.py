@@ -17,7 +17,7 @@ class HealthChecker:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         self.paths = self.config.get("paths", {})
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
 
     def get_worker_status(self) -> Dict[str, Any]:
         """Check worker process status"""
@@ -127,7 +127,7 @@ class HealthChecker:
 
     def get_full_health(self) -> Dict[str, Any]:
         """Get complete health status"""
-        uptime_seconds = time.time() - self.start_time
+        uptime_seconds = time.monotonic() - self.start_time
 
         return {
             "status": "healthy",
@@ -5,18 +5,30 @@
 
 import json
 import os
+import re
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import ClassVar, Dict, Any, Optional, Set
 from pathlib import Path
 from src.job_models import Job, JobStatus
 
+# 合法的任务 ID：仅允许字母、数字、下划线和连字符，拒绝路径穿越字符
+_JOB_ID_RE = re.compile(r"\A[A-Za-z0-9_-]{1,64}\Z")
+
 
 class JobStatusUpdater:
     """任务状态更新器"""
 
+    # 已创建过的目录，避免每次实例化都执行 mkdir 系统调用
+    _created_dirs: ClassVar[Set[str]] = set()
+
     def __init__(self, jobs_dir: str = "logs/jobs"):
         self.jobs_dir = Path(jobs_dir)
-        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        key = str(self.jobs_dir)
+        if key not in JobStatusUpdater._created_dirs:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            JobStatusUpdater._created_dirs.add(key)
+        # update_job 是高频路径，使用字符串路径避免每次构造 Path 对象
+        self._jobs_dir_str = os.fspath(self.jobs_dir)
 
     def update_job(self, job_id: str, **kwargs) -> bool:
         """
@@ -26,14 +38,14 @@ class JobStatusUpdater:
             job_id: 任务 ID
             **kwargs: 要更新的字段 (status, progress, message, stage, result, error 等)
         """
-        if not job_id:
+        if not job_id or not _JOB_ID_RE.match(job_id):
             return False
 
-        job_file = self.jobs_dir / f"{job_id}.json"
+        job_file = f"{self._jobs_dir_str}/{job_id}.json"
 
         # 尝试读取现有任务
         job_data = {}
-        if job_file.exists():
+        if os.path.exists(job_file):
             try:
                 with open(job_file, "r", encoding="utf-8") as f:
                     job_data = json.load(f)
@@ -0,0 +1,43 @@
+"""
+JSON 工具模块
+优先使用 orjson 进行序列化/反序列化，未安装时回退到标准库 json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+# 解析失败时抛出的异常（orjson.JSONDecodeError 是 json.JSONDecodeError 的子类）
+JSONDecodeError = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    解析 JSON
+
+    Args:
+        data: JSON 文本，直接传入 bytes（如 response.content）可省去解码
+
+    Raises:
+        JSONDecodeError: 不是合法的 JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    序列化为 UTF-8 编码的 JSON 字节串，可直接作为请求/响应体
+
+    Args:
+        obj: 可 JSON 序列化的对象
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
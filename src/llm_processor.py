@@ -8,7 +8,6 @@ LLM 内容处理模块
 - 前端用户无感知
 """
 
-import os
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, TypedDict
 
@@ -128,24 +127,25 @@ class LLMProcessor:
             },
         )
 
-        for attempt in range(max_retries):
-            try:
-                # 加载 Prompt
-                system_prompt = self._load_system_prompt()
-                user_prompt = self._build_user_prompt(title, content)
+        # 加载 Prompt：重试期间内容不变，只需构建一次消息列表
+        system_prompt = self._load_system_prompt()
+        user_prompt = self._build_user_prompt(title, content)
 
-                logger.debug(
-                    f"LLM prompt prepared",
-                    context={
-                        "model": current_model,
-                        "system_prompt_preview": system_prompt[:100] + "...",
-                        "user_prompt_preview": user_prompt[:200] + "...",
-                        "user_prompt_length": len(user_prompt),
-                    },
-                )
+        logger.debug(
+            f"LLM prompt prepared",
+            context={
+                "model": current_model,
+                "system_prompt_preview": system_prompt[:100] + "...",
+                "user_prompt_preview": user_prompt[:200] + "...",
+                "user_prompt_length": len(user_prompt),
+            },
+        )
+
+        messages = self._provider.format_messages(system_prompt, user_prompt)
 
+        for attempt in range(max_retries):
+            try:
                 # 调用 LLM
-                messages = self._provider.format_messages(system_prompt, user_prompt)
                 result = self._provider.chat_completion(messages)
 
                 logger.debug(
@@ -189,6 +189,10 @@ class LLMProcessor:
                     # 尝试切换模型
                     if self._try_switch_model():
                         current_model = self.provider_info.model
+                        # 消息格式可能因 Provider 而异，切换后重新格式化
+                        messages = self._provider.format_messages(
+                            system_prompt, user_prompt
+                        )
                         logger.info(f"Switched to new model: {current_model}")
                         continue  # 用新模型重试
                     else:
@@ -212,6 +216,9 @@ class LLMProcessor:
                 # 尝试切换模型
                 if self._try_switch_model():
                     current_model = self.provider_info.model
+                    messages = self._provider.format_messages(
+                        system_prompt, user_prompt
+                    )
                     logger.info(
                         f"Switched to new model after exception: {current_model}"
                     )
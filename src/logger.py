@@ -3,14 +3,102 @@
 提供详细的日志记录，支持不同级别和上下文信息
 """
 
+import atexit
 import json
 import logging
+import queue
 import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, is_dataclass
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Union
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时回退到标准库
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """无法直接序列化的值：事件 dataclass 展开为字典，其余转为字符串"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    return str(obj)
+
+
+def _dumps(obj: Any) -> str:
+    """序列化为 JSON 字符串，优先使用 orjson（原生支持 dataclass）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # 超出 orjson 支持范围的值（如超大整数）交给标准库处理
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=_json_default)
+
+
+# 各 logger 的后台文件写入线程，按 logger 名称索引
+_listeners: Dict[str, QueueListener] = {}
+
+
+def _stop_listeners() -> None:
+    """停止所有后台写入线程，确保退出前日志全部落盘"""
+    for listener in list(_listeners.values()):
+        listener.stop()
+    _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    带写缓冲的文件处理器
+    
+    以 64 KiB 缓冲打开日志文件，普通记录只写入缓冲区，不逐条 flush；
+    ERROR 及以上级别立即落盘。其余记录由写入线程在队列排空时统一 flush
+    """
+    
+    buffer_size = 65536
+    
+    def _open(self):
+        # FileHandler 从 Python 3.9 起才有 errors 属性
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=getattr(self, 'errors', None)
+        )
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _FlushingQueueListener(QueueListener):
+    """队列排空时 flush 所有处理器，突发日志合并为少量 write() 调用"""
+    
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
 
 class LogLevel(Enum):
     """日志级别"""
@@ -21,6 +109,70 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+# 固定结构的日志事件
+# 字段固定的事件用 dataclass 描述，orjson 直接按字段编码，无需先构造中间字典
+
+@dataclass
+class JobStartEvent:
+    """任务开始事件"""
+    job_id: str
+    url: str
+    llm_model: str
+    tts_model: str
+    need_summary: bool
+    event: str = "job_start"
+
+
+@dataclass
+class JobCompleteEvent:
+    """任务完成事件"""
+    job_id: str
+    duration: float
+    output_file: str
+    tokens_used: int
+    event: str = "job_complete"
+
+
+@dataclass
+class JobCancelledEvent:
+    """任务取消事件"""
+    job_id: str
+    reason: str
+    event: str = "job_cancelled"
+
+
+@dataclass
+class ApiRequestEvent:
+    """API 请求事件"""
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    client_ip: Optional[str]
+    event: str = "api_request"
+
+
+@dataclass
+class TimeoutWarningEvent:
+    """超时警告事件"""
+    job_id: str
+    stage: str
+    elapsed_seconds: float
+    timeout_seconds: float
+    event: str = "timeout_warning"
+
+
+# 日志上下文：自由结构的字典，或上面的固定结构事件
+LogContext = Union[
+    Dict[str, Any],
+    JobStartEvent,
+    JobCompleteEvent,
+    JobCancelledEvent,
+    ApiRequestEvent,
+    TimeoutWarningEvent,
+]
+
+
 class StructuredLogger:
     """
     结构化日志记录器
@@ -30,8 +182,22 @@ class StructuredLogger:
     - 自动添加上下文信息（时间、模块、行号）
     - 支持不同日志级别
     - 同时输出到文件和控制台
+    - 支持 % 风格的延迟格式化参数，如 logger.info("x=%s", x)，
+      日志级别被过滤时不做任何字符串格式化
     """
     
+    # 按秒缓存的时间戳 (整数秒, ISO 字符串)，同一秒内的日志无需重新格式化
+    _ts_cache = (0, "")
+    
+    # LogLevel 到 logging 级别的映射
+    _LEVEL_MAP = {
+        LogLevel.DEBUG: logging.DEBUG,
+        LogLevel.INFO: logging.INFO,
+        LogLevel.WARNING: logging.WARNING,
+        LogLevel.ERROR: logging.ERROR,
+        LogLevel.CRITICAL: logging.CRITICAL
+    }
+    
     def __init__(
         self,
         name: str,
@@ -41,6 +207,8 @@ class StructuredLogger:
         console_output: bool = True
     ):
         self.name = name
+        # logger 名称固定，预先编码为 JSON 片段
+        self._name_json = _dumps(name)
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_file = self.log_dir / log_file
@@ -51,18 +219,32 @@ class StructuredLogger:
         self._logger = logging.getLogger(name)
         self._logger.setLevel(self._get_logging_level(level))
         
-        # 清除现有处理器
+        # 清除现有处理器，并停止同名 logger 之前的写入线程
         self._logger.handlers.clear()
+        previous = _listeners.pop(name, None)
+        if previous is not None:
+            previous.stop()
+            for handler in previous.handlers:
+                handler.close()
         
-        # 文件处理器
-        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        # 文件处理器：经队列交给后台线程写入，调用方不阻塞在磁盘 I/O 上
+        # 延迟到第一条记录时才打开文件
+        file_handler = _BufferedFileHandler(
+            self.log_file, encoding='utf-8', delay=True
+        )
         file_handler.setLevel(logging.DEBUG)
         file_formatter = logging.Formatter(
             '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        self._logger.addHandler(file_handler)
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = _FlushingQueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        _listeners[name] = self._listener
+        self._logger.addHandler(QueueHandler(log_queue))
         
         # 控制台处理器
         if console_output:
@@ -77,78 +259,123 @@ class StructuredLogger:
     
     def _get_logging_level(self, level: LogLevel) -> int:
         """转换日志级别"""
-        levels = {
-            LogLevel.DEBUG: logging.DEBUG,
-            LogLevel.INFO: logging.INFO,
-            LogLevel.WARNING: logging.WARNING,
-            LogLevel.ERROR: logging.ERROR,
-            LogLevel.CRITICAL: logging.CRITICAL
-        }
-        return levels.get(level, logging.INFO)
+        return self._LEVEL_MAP.get(level, logging.INFO)
     
     def _format_message(
         self,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        context: Optional[LogContext] = None,
         error: Optional[Exception] = None
     ) -> str:
         """格式化日志消息"""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "logger": self.name,
-            "message": message
-        }
+        # 按字段拼接 JSON 片段：固定键和 logger 名称已预先编码，
+        # 只对上下文和异常单独序列化，不再构造合并后的中间字典
+        head = (
+            f'{{"timestamp":"{self._timestamp()}",'
+            f'"logger":{self._name_json},'
+            f'"message":{_dumps(message)}'
+        )
+        if not context and not error:
+            return head + "}"
         
+        parts = [head]
         if context:
-            log_entry["context"] = context
-        
+            parts.append(f',"context":{_dumps(context)}')
         if error:
-            log_entry["error"] = {
+            error_info = {
                 "type": type(error).__name__,
                 "message": str(error),
                 "traceback": self._get_traceback(error)
             }
-        
-        return json.dumps(log_entry, ensure_ascii=False, default=str)
+            parts.append(f',"error":{_dumps(error_info)}')
+        parts.append("}")
+        return "".join(parts)
+    
+    def _timestamp(self) -> str:
+        """获取当前时间戳（ISO 格式，毫秒精度）"""
+        now = time.time()
+        sec = int(now)
+        cached_sec, cached_str = StructuredLogger._ts_cache
+        if sec != cached_sec:
+            # 整体替换元组，多线程下不会读到半更新的缓存
+            cached_str = datetime.fromtimestamp(sec).isoformat()
+            StructuredLogger._ts_cache = (sec, cached_str)
+        return f"{cached_str}.{int((now - sec) * 1000):03d}"
     
     def _get_traceback(self, error: Exception) -> str:
-        """获取异常堆栈"""
-        import traceback
-        return traceback.format_exc()
+        """获取异常堆栈（基于传入的异常对象，而非当前正在处理的异常）"""
+        if error.__traceback__ is None:
+            return ""
+        return "".join(
+            traceback.format_exception(type(error), error, error.__traceback__)
+        )
     
-    def debug(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+    def debug(
+        self,
+        message: str,
+        *args: Any,
+        context: Optional[LogContext] = None
+    ) -> None:
         """调试日志"""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        if args:
+            message = message % args
         self._logger.debug(self._format_message(message, context))
     
-    def info(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+    def info(
+        self,
+        message: str,
+        *args: Any,
+        context: Optional[LogContext] = None
+    ) -> None:
         """信息日志"""
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
+        if args:
+            message = message % args
         self._logger.info(self._format_message(message, context))
     
     def warning(
         self,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        *args: Any,
+        context: Optional[LogContext] = None,
         error: Optional[Exception] = None
     ) -> None:
         """警告日志"""
+        if not self._logger.isEnabledFor(logging.WARNING):
+            return
+        if args:
+            message = message % args
         self._logger.warning(self._format_message(message, context, error))
     
     def error(
         self,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        *args: Any,
+        context: Optional[LogContext] = None,
         error: Optional[Exception] = None
     ) -> None:
         """错误日志"""
+        if not self._logger.isEnabledFor(logging.ERROR):
+            return
+        if args:
+            message = message % args
         self._logger.error(self._format_message(message, context, error))
     
     def critical(
         self,
         message: str,
-        context: Optional[Dict[str, Any]] = None,
+        *args: Any,
+        context: Optional[LogContext] = None,
         error: Optional[Exception] = None
     ) -> None:
         """严重错误日志"""
+        if not self._logger.isEnabledFor(logging.CRITICAL):
+            return
+        if args:
+            message = message % args
         self._logger.critical(self._format_message(message, context, error))
     
     def log_job_start(
@@ -162,14 +389,7 @@ class StructuredLogger:
         """记录任务开始"""
         self.info(
             f"Job {job_id} started",
-            context={
-                "job_id": job_id,
-                "url": url,
-                "llm_model": llm_model,
-                "tts_model": tts_model,
-                "need_summary": need_summary,
-                "event": "job_start"
-            }
+            context=JobStartEvent(job_id, url, llm_model, tts_model, need_summary)
         )
     
     def log_job_progress(
@@ -202,13 +422,7 @@ class StructuredLogger:
         """记录任务完成"""
         self.info(
             f"Job {job_id} completed in {duration:.2f}s",
-            context={
-                "job_id": job_id,
-                "duration": duration,
-                "output_file": output_file,
-                "tokens_used": tokens_used,
-                "event": "job_complete"
-            }
+            context=JobCompleteEvent(job_id, duration, output_file, tokens_used)
         )
     
     def log_job_error(
@@ -237,11 +451,7 @@ class StructuredLogger:
         """记录任务取消"""
         self.warning(
             f"Job {job_id} cancelled: {reason}",
-            context={
-                "job_id": job_id,
-                "reason": reason,
-                "event": "job_cancelled"
-            }
+            context=JobCancelledEvent(job_id, reason)
         )
     
     def log_api_request(
@@ -255,14 +465,9 @@ class StructuredLogger:
         """记录API请求"""
         self.debug(
             f"API {method} {path} -> {status_code}",
-            context={
-                "method": method,
-                "path": path,
-                "status_code": status_code,
-                "duration_ms": duration_ms,
-                "client_ip": client_ip,
-                "event": "api_request"
-            }
+            context=ApiRequestEvent(
+                method, path, status_code, duration_ms, client_ip
+            )
         )
     
     def log_timeout(
@@ -275,13 +480,7 @@ class StructuredLogger:
         """记录超时警告"""
         self.warning(
             f"Job {job_id} timeout warning at stage '{stage}'",
-            context={
-                "job_id": job_id,
-                "stage": stage,
-                "elapsed_seconds": elapsed,
-                "timeout_seconds": timeout,
-                "event": "timeout_warning"
-            }
+            context=TimeoutWarningEvent(job_id, stage, elapsed, timeout)
         )
 
 
@@ -6,15 +6,139 @@
 import time
 import os
 import json
-from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import random
+import threading
+from collections import ChainMap
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import (
+    Any, Callable, Dict, List, Mapping, MutableMapping, NamedTuple, Optional,
+    Set, Tuple, Union
+)
 from pathlib import Path
 from datetime import datetime, timedelta
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from .logger import get_logger
 
 logger = get_logger("model_health")
 
 
+@dataclass(frozen=True)
+class LLMModelSpec:
+    """LLM 模型配置（不可变，可在线程间共享）"""
+    provider: str
+    model: str
+    api_key_env: str
+    base_url: str
+    priority: int
+    
+    @property
+    def name(self) -> str:
+        """日志和状态中显示的名称"""
+        return self.model
+    
+    @property
+    def credential_envs(self) -> Dict[str, str]:
+        """凭据名 -> 环境变量名"""
+        return {"api_key": self.api_key_env}
+
+
+@dataclass(frozen=True)
+class TTSModelSpec:
+    """TTS 模型配置（不可变，可在线程间共享）"""
+    provider: str
+    voice: str
+    priority: int
+    api_key_env: Optional[str] = None
+    appid_env: Optional[str] = None
+    
+    @property
+    def name(self) -> str:
+        """日志和状态中显示的名称"""
+        return self.provider
+    
+    @property
+    def credential_envs(self) -> Dict[str, str]:
+        """凭据名 -> 环境变量名（免费服务没有凭据）"""
+        envs = {"api_key": self.api_key_env, "appid": self.appid_env}
+        return {name: env for name, env in envs.items() if env}
+
+
+ModelSpec = Union[LLMModelSpec, TTSModelSpec]
+
+
+@lru_cache(maxsize=None)
+def _spec_dict(spec: ModelSpec) -> Mapping[str, Any]:
+    """模型配置的只读字典形式（省略未设置的字段），每个配置只转换一次"""
+    return MappingProxyType(
+        {key: value for key, value in asdict(spec).items() if value is not None}
+    )
+
+
+def _status_ok(response: requests.Response) -> bool:
+    """HTTP 200 即视为可用"""
+    return response.status_code == 200
+
+
+def _volcengine_body(config: TTSModelSpec, creds: Dict[str, str]) -> Dict[str, Any]:
+    """火山引擎 TTS 探测请求体"""
+    return {
+        "app": {"appid": creds["appid"], "token": creds["api_key"], "cluster": "volcano_tts"},
+        "user": {"uid": "health-check"},
+        "audio": {"voice_type": config.voice, "encoding": "mp3"},
+        "request": {"reqid": "health-check", "text": "测试", "text_type": "plain", "operation": "sync"}
+    }
+
+
+def _volcengine_ok(response: requests.Response) -> bool:
+    """火山引擎返回 code 0（或仅文本相关错误）即视为可用"""
+    if response.status_code != 200:
+        return False
+    data = response.json()
+    return data.get("code") == 0 or "text" in str(data.get("message", "")).lower()
+
+
+class _ProbeSpec(NamedTuple):
+    """单个 provider 的 HTTP 探测方式"""
+    method: str
+    # URL 模板，可引用模型配置字段，如 "{base_url}/models"
+    url: str
+    # Authorization 头模板，可引用凭据字段（api_key / appid）
+    auth: str = "Bearer {api_key}"
+    # 请求体构造函数 (模型配置, 凭据) -> JSON；None 表示无请求体
+    body: Optional[Callable[[Any, Dict[str, str]], Dict[str, Any]]] = None
+    # 根据响应判断是否可用
+    accept: Callable[[requests.Response], bool] = _status_ok
+
+
+# 查询模型列表即可验证端点和 API key，无需触发真实推理（不消耗 token）
+_LLM_LIST_MODELS = _ProbeSpec("GET", "{base_url}/models")
+
+# (模型类型, provider) -> 探测方式
+_PROBES: Dict[Tuple[str, str], _ProbeSpec] = {
+    ("llm", "nvidia"): _LLM_LIST_MODELS,
+    ("llm", "openai"): _LLM_LIST_MODELS,
+    ("tts", "volcengine"): _ProbeSpec(
+        "POST",
+        "https://openspeech.bytedance.com/api/v1/tts",
+        auth="Bearer;{api_key}",
+        body=_volcengine_body,
+        accept=_volcengine_ok,
+    ),
+    ("tts", "openai"): _ProbeSpec("GET", "https://api.openai.com/v1/models"),
+}
+
+# 无需探测、总是可用的模型（免费服务）
+_ALWAYS_AVAILABLE = {("tts", "edge-tts")}
+
+
 class ModelHealthChecker:
     """
     模型健康检查器 - 具体模型级别
@@ -26,295 +150,539 @@ class ModelHealthChecker:
     - 前端用户无感知
     """
     
-    # 模型配置（provider, model_name, api_key_env, base_url）
-    LLM_MODELS = [
-        {
-            "provider": "nvidia",
-            "model": "deepseek-ai/deepseek-v3.2",
-            "api_key_env": "NVIDIA_API_KEY",
-            "base_url": "https://integrate.api.nvidia.com/v1",
-            "priority": 1
-        },
-        {
-            "provider": "nvidia", 
-            "model": "meta/llama-3.1-405b-instruct",
-            "api_key_env": "NVIDIA_API_KEY",
-            "base_url": "https://integrate.api.nvidia.com/v1",
-            "priority": 2
-        },
-        {
-            "provider": "openai",
-            "model": "gpt-4o",
-            "api_key_env": "OPENAI_API_KEY",
-            "base_url": "https://api.openai.com/v1",
-            "priority": 3
-        },
-        {
-            "provider": "openai",
-            "model": "gpt-3.5-turbo",
-            "api_key_env": "OPENAI_API_KEY",
-            "base_url": "https://api.openai.com/v1",
-            "priority": 4
-        }
-    ]
-    
-    TTS_MODELS = [
-        {
-            "provider": "volcengine",
-            "voice": "zh_female_xiaoxiao",
-            "api_key_env": "VOLCENGINE_TOKEN",
-            "appid_env": "VOLCENGINE_APPID",
-            "priority": 1
-        },
-        {
-            "provider": "openai",
-            "voice": "alloy",
-            "api_key_env": "OPENAI_API_KEY",
-            "priority": 2
-        },
-        {
-            "provider": "edge-tts",
-            "voice": "zh-CN-XiaoxiaoNeural",
-            "priority": 3  # 免费，总是可用
-        }
-    ]
+    # 模型配置，按优先级排列
+    LLM_MODELS: Tuple[LLMModelSpec, ...] = (
+        LLMModelSpec(
+            provider="nvidia",
+            model="deepseek-ai/deepseek-v3.2",
+            api_key_env="NVIDIA_API_KEY",
+            base_url="https://integrate.api.nvidia.com/v1",
+            priority=1
+        ),
+        LLMModelSpec(
+            provider="nvidia",
+            model="meta/llama-3.1-405b-instruct",
+            api_key_env="NVIDIA_API_KEY",
+            base_url="https://integrate.api.nvidia.com/v1",
+            priority=2
+        ),
+        LLMModelSpec(
+            provider="openai",
+            model="gpt-4o",
+            api_key_env="OPENAI_API_KEY",
+            base_url="https://api.openai.com/v1",
+            priority=3
+        ),
+        LLMModelSpec(
+            provider="openai",
+            model="gpt-3.5-turbo",
+            api_key_env="OPENAI_API_KEY",
+            base_url="https://api.openai.com/v1",
+            priority=4
+        ),
+    )
+    
+    TTS_MODELS: Tuple[TTSModelSpec, ...] = (
+        TTSModelSpec(
+            provider="volcengine",
+            voice="zh_female_xiaoxiao",
+            api_key_env="VOLCENGINE_TOKEN",
+            appid_env="VOLCENGINE_APPID",
+            priority=1
+        ),
+        TTSModelSpec(
+            provider="openai",
+            voice="alloy",
+            api_key_env="OPENAI_API_KEY",
+            priority=2
+        ),
+        TTSModelSpec(
+            provider="edge-tts",
+            voice="zh-CN-XiaoxiaoNeural",
+            priority=3  # 免费，总是可用
+        ),
+    )
+    
+    # 健康探测结果的复用时间（秒）
+    CACHE_TTL = 60
+    
+    # 单次探测的 (连接, 读取) 超时（秒），握手卡住的端点不会占满整个读超时
+    PROBE_TIMEOUT = (2, 5)
     
-    def __init__(self, cache_file: str = "logs/model_health_cache.json"):
+    # 全量复检间隔（秒）及随机抖动上限，避免多个进程同时复检
+    RECHECK_TTL = 300
+    RECHECK_JITTER = 60
+    
+    def __init__(
+        self,
+        cache_file: str = "logs/model_health_cache.json",
+        startup_deadline_s: float = 15.0
+    ):
+        """
+        Args:
+            cache_file: 健康检查结果缓存文件
+            startup_deadline_s: 启动自检的总时限（秒），超时未返回的模型视为不可用
+        """
         self.cache_file = Path(cache_file)
+        self.startup_deadline_s = startup_deadline_s
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
         
         # 可用模型缓存
-        self._available_llm: List[Dict[str, Any]] = []
-        self._available_tts: List[Dict[str, Any]] = []
+        self._available_llm: List[LLMModelSpec] = []
+        self._available_tts: List[TTSModelSpec] = []
         self._last_check: Optional[datetime] = None
         
         # 当前使用的模型索引
         self._current_llm_index = 0
         self._current_tts_index = 0
         
-        # 服务启动时执行自检
-        self._startup_health_check()
+        # 上次写入缓存文件的内容摘要，内容未变时跳过写盘
+        self._last_cache_hash: Optional[bytes] = None
+        
+        # 下次全量复检的时间（monotonic），以及是否已有复检在后台进行
+        self._next_check_at = 0.0
+        self._refreshing = False
+        # 保护可用模型列表和当前索引的整体替换
+        self._state_lock = threading.Lock()
+        
+        # 复用 HTTP 连接（keep-alive），同一主机的重复探测无需重新握手；
+        # 探测失败即视为不可用，不在连接层重试
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        # 单个模型的探测结果缓存: (模型类型, 模型配置) -> (探测时间, 是否可用)
+        self._health_cache: Dict[Tuple[str, ModelSpec], Tuple[float, bool]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # 常驻探测线程池，重复探测时无需再创建线程
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.LLM_MODELS) + len(self.TTS_MODELS),
+            thread_name_prefix="model-health",
+        )
+        # 已提交、尚未完成的探测任务，close 时取消
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        
+        # 服务启动时执行自检（上次结果仍有效时直接复用）
+        if not self._load_cache():
+            self._startup_health_check()
+    
+    def _configured_env(self) -> List[str]:
+        """已设置的凭据环境变量名（只记录名称，不记录值）"""
+        names = {
+            env_name
+            for config in self.LLM_MODELS + self.TTS_MODELS
+            for env_name in config.credential_envs.values()
+            if os.environ.get(env_name)
+        }
+        return sorted(names)
+    
+    def _load_cache(self) -> bool:
+        """
+        复用上次保存的健康检查结果
+        
+        缓存在 RECHECK_TTL 内且凭据环境变量与保存时一致时直接恢复可用列表，
+        跳过启动探测；缓存缺失、损坏或过期时返回 False
+        """
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            checked_at = datetime.fromisoformat(data["timestamp"])
+            cached_llm = [
+                self._match_spec(self.LLM_MODELS, item) for item in data["available_llm"]
+            ]
+            cached_tts = [
+                self._match_spec(self.TTS_MODELS, item) for item in data["available_tts"]
+            ]
+            llm_index = int(data["current_llm_index"])
+            tts_index = int(data["current_tts_index"])
+            configured_env = data["configured_env"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return False
+        
+        age = (datetime.now() - checked_at).total_seconds()
+        if not 0 <= age < self.RECHECK_TTL:
+            return False
+        if configured_env != self._configured_env():
+            # 新增或移除了 API key，之前的探测结果不再可信
+            return False
+        
+        # 只恢复仍在模型表中的配置
+        available_llm = [m for m in self.LLM_MODELS if m in cached_llm]
+        available_tts = [m for m in self.TTS_MODELS if m in cached_tts]
+        
+        with self._state_lock:
+            self._current_llm_index = self._reindex(cached_llm, llm_index, available_llm)
+            self._current_tts_index = self._reindex(cached_tts, tts_index, available_tts)
+            self._available_llm = available_llm
+            self._available_tts = available_tts
+        
+        self._last_check = checked_at
+        self._next_check_at = (
+            time.monotonic()
+            + (self.RECHECK_TTL - age)
+            + random.uniform(0, self.RECHECK_JITTER)
+        )
+        
+        logger.info(
+            "Reusing model health results from %.0fs ago: %d LLM, %d TTS models",
+            age,
+            len(self._available_llm),
+            len(self._available_tts),
+        )
+        return True
+    
+    @staticmethod
+    def _match_spec(
+        table: Tuple[ModelSpec, ...],
+        data: Dict[str, Any]
+    ) -> Optional[ModelSpec]:
+        """在模型表中查找与缓存文件中的字典一致的配置，已不在表中返回 None"""
+        return next((spec for spec in table if _spec_dict(spec) == data), None)
     
     def _startup_health_check(self) -> None:
         """服务启动时执行完整自检"""
         logger.info("Starting model health check on startup...")
+        self._full_health_check()
+    
+    def _maybe_refresh(self) -> None:
+        """复检时间已到时在后台发起全量复检，调用方直接使用当前结果、不等待"""
+        if self._refreshing or time.monotonic() < self._next_check_at:
+            return
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._background_refresh,
+            name="model-health-refresh",
+            daemon=True,
+        ).start()
+    
+    def _background_refresh(self) -> None:
+        """后台全量复检"""
+        try:
+            logger.info("Re-checking models after health TTL expired...")
+            self._full_health_check()
+        except Exception as e:
+            logger.error("Background model health check failed: %s", e)
+        finally:
+            self._refreshing = False
+    
+    @staticmethod
+    def _reindex(
+        old_models: List[Optional[ModelSpec]],
+        old_index: int,
+        new_models: List[ModelSpec]
+    ) -> int:
+        """复检后尽量保持当前使用的模型不变，已不可用则回到优先级最高的模型"""
+        if old_index < len(old_models) and old_models[old_index] in new_models:
+            return new_models.index(old_models[old_index])
+        return 0
+    
+    def _full_health_check(self) -> None:
+        """探测所有模型并更新可用列表"""
+        # LLM 和 TTS 模型一起并发探测，结果按优先级顺序处理
+        targets = [("llm", config) for config in self.LLM_MODELS]
+        targets += [("tts", config) for config in self.TTS_MODELS]
+        results = self._probe_models(targets)
+        llm_results = results[:len(self.LLM_MODELS)]
+        tts_results = results[len(self.LLM_MODELS):]
         
         # 检查 LLM 模型
-        self._available_llm = []
-        for model_config in self.LLM_MODELS:
-            if self._check_llm_model(model_config):
-                self._available_llm.append(model_config)
-                logger.info(f"✅ LLM model available: {model_config['model']}")
+        available_llm = []
+        for model_config, available in zip(self.LLM_MODELS, llm_results):
+            if available:
+                available_llm.append(model_config)
+                logger.info("✅ LLM model available: %s", model_config.model)
             else:
-                logger.warning(f"❌ LLM model unavailable: {model_config['model']}")
+                logger.warning("❌ LLM model unavailable: %s", model_config.model)
         
         # 检查 TTS 模型
-        self._available_tts = []
-        for model_config in self.TTS_MODELS:
-            if self._check_tts_model(model_config):
-                self._available_tts.append(model_config)
-                logger.info(f"✅ TTS model available: {model_config['provider']}")
+        available_tts = []
+        for model_config, available in zip(self.TTS_MODELS, tts_results):
+            if available:
+                available_tts.append(model_config)
+                logger.info("✅ TTS model available: %s", model_config.provider)
             else:
-                logger.warning(f"❌ TTS model unavailable: {model_config['provider']}")
+                logger.warning("❌ TTS model unavailable: %s", model_config.provider)
+        
+        with self._state_lock:
+            self._current_llm_index = self._reindex(
+                self._available_llm, self._current_llm_index, available_llm
+            )
+            self._current_tts_index = self._reindex(
+                self._available_tts, self._current_tts_index, available_tts
+            )
+            self._available_llm = available_llm
+            self._available_tts = available_tts
         
         self._last_check = datetime.now()
+        self._next_check_at = (
+            time.monotonic()
+            + self.RECHECK_TTL
+            + random.uniform(0, self.RECHECK_JITTER)
+        )
         
         # 保存缓存
         self._save_cache()
         
         logger.info(
-            f"Health check complete. Available: {len(self._available_llm)} LLM, "
-            f"{len(self._available_tts)} TTS models"
+            "Health check complete. Available: %d LLM, %d TTS models",
+            len(self._available_llm),
+            len(self._available_tts),
         )
     
-    def _check_llm_model(self, config: Dict[str, Any]) -> bool:
-        """检查具体 LLM 模型是否可用"""
+    def _probe_models(
+        self, targets: List[Tuple[str, ModelSpec]]
+    ) -> List[bool]:
+        """
+        并发探测一组模型
+        
+        各探测都是独立的网络请求，并发执行后总耗时取决于最慢的一个，
+        而不是所有超时之和；超过 startup_deadline_s 仍未返回的探测
+        直接视为不可用，不再等待
+        
+        Args:
+            targets: (模型类型 "llm"/"tts", 模型配置) 列表
+        
+        Returns:
+            与 targets 顺序一致的可用性列表
+        """
+        results = [False] * len(targets)
+        futures = {
+            self._submit(self._check_model, model_type, config): index
+            for index, (model_type, config) in enumerate(targets)
+        }
+        
         try:
-            import requests
-            
-            api_key = os.environ.get(config["api_key_env"])
-            if not api_key:
-                return False
-            
-            # 发送简单测试请求
-            response = requests.post(
-                f"{config['base_url']}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": config["model"],
-                    "messages": [{"role": "user", "content": "Hi"}],
-                    "max_tokens": 5
-                },
-                timeout=10
+            for future in as_completed(futures, timeout=self.startup_deadline_s):
+                results[futures[future]] = future.result()
+        except FuturesTimeoutError:
+            stragglers = [future for future in futures if not future.done()]
+            for future in stragglers:
+                future.cancel()
+            logger.warning(
+                "%d model probe(s) exceeded the %.1fs startup deadline, "
+                "marked unavailable",
+                len(stragglers),
+                self.startup_deadline_s,
             )
-            
-            return response.status_code == 200
-            
-        except Exception as e:
-            logger.debug(f"LLM health check failed for {config['model']}: {e}")
-            return False
-    
-    def _check_tts_model(self, config: Dict[str, Any]) -> bool:
-        """检查具体 TTS 模型是否可用"""
-        provider = config["provider"]
         
-        try:
-            if provider == "volcengine":
-                return self._check_volcengine(config)
-            elif provider == "openai":
-                return self._check_openai_tts(config)
-            elif provider == "edge-tts":
-                return True  # 免费服务，假设可用
-            return False
-        except Exception as e:
-            logger.debug(f"TTS health check failed for {provider}: {e}")
-            return False
+        return results
     
-    def _check_volcengine(self, config: Dict[str, Any]) -> bool:
-        """检查火山引擎"""
-        import requests
+    def _cache_key(self, model_type: str, config: ModelSpec) -> Tuple[str, ModelSpec]:
+        """生成探测结果缓存键（模型配置不可变，可直接作为键）"""
+        return (model_type, config)
+    
+    def _check_model(
+        self,
+        model_type: str,
+        config: ModelSpec
+    ) -> bool:
+        """
+        检查模型是否可用
         
-        api_key = os.environ.get(config["api_key_env"])
-        appid = os.environ.get(config["appid_env"])
+        CACHE_TTL 内探测为可用的结果直接复用，不再发起网络请求；
+        不可用的结果不缓存，以便故障恢复后能及时发现
         
-        if not api_key or not appid:
-            return False
+        Args:
+            model_type: "llm" 或 "tts"
+            config: 模型配置
+        """
+        key = self._cache_key(model_type, config)
+        with self._cache_lock:
+            entry = self._health_cache.get(key)
+        if entry and entry[1] and time.monotonic() - entry[0] < self.CACHE_TTL:
+            return True
         
-        response = requests.post(
-            "https://openspeech.bytedance.com/api/v1/tts",
-            headers={
-                "Authorization": f"Bearer;{api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "app": {"appid": appid, "token": api_key, "cluster": "volcano_tts"},
-                "user": {"uid": "health-check"},
-                "audio": {"voice_type": config["voice"], "encoding": "mp3"},
-                "request": {"reqid": "health-check", "text": "测试", "text_type": "plain", "operation": "sync"}
-            },
-            timeout=10
-        )
+        available = self._probe(model_type, config)
         
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("code") == 0 or "text" in str(data.get("message", "")).lower()
-        return False
+        with self._cache_lock:
+            self._health_cache[key] = (time.monotonic(), available)
+        return available
     
-    def _check_openai_tts(self, config: Dict[str, Any]) -> bool:
-        """检查 OpenAI TTS"""
-        import requests
-        
-        api_key = os.environ.get(config["api_key_env"])
-        if not api_key:
+    def _probe(self, model_type: str, config: ModelSpec) -> bool:
+        """按 _PROBES 表探测单个模型是否可用"""
+        provider = config.provider
+        if (model_type, provider) in _ALWAYS_AVAILABLE:
+            return True
+        spec = _PROBES.get((model_type, provider))
+        if spec is None:
             return False
         
-        # 检查 API key 是否有效
-        response = requests.get(
-            "https://api.openai.com/v1/models",
-            headers={"Authorization": f"Bearer {api_key}"},
-            timeout=10
-        )
+        # 凭据来自配置指定的环境变量，缺任意一个即视为不可用
+        creds = {
+            name: os.environ.get(env_name)
+            for name, env_name in config.credential_envs.items()
+        }
+        if not all(creds.values()):
+            return False
         
-        return response.status_code == 200
+        try:
+            headers = {"Authorization": spec.auth.format(**creds)}
+            body = spec.body(config, creds) if spec.body else None
+            response = self._session.request(
+                spec.method,
+                spec.url.format_map(_spec_dict(config)),
+                headers=headers,
+                json=body,
+                timeout=self.PROBE_TIMEOUT
+            )
+            return spec.accept(response)
+        except Exception as e:
+            logger.debug(
+                "%s health check failed for %s: %s",
+                model_type.upper(),
+                config.name,
+                e,
+            )
+            return False
     
     def _save_cache(self) -> None:
         """保存健康检查结果到缓存文件"""
         cache_data = {
             "timestamp": self._last_check.isoformat() if self._last_check else None,
-            "available_llm": self._available_llm,
-            "available_tts": self._available_tts,
+            "available_llm": [dict(_spec_dict(m)) for m in self._available_llm],
+            "available_tts": [dict(_spec_dict(m)) for m in self._available_tts],
             "current_llm_index": self._current_llm_index,
-            "current_tts_index": self._current_tts_index
+            "current_tts_index": self._current_tts_index,
+            "configured_env": self._configured_env()
         }
         
+        payload = json.dumps(
+            cache_data, ensure_ascii=False, indent=2, sort_keys=True
+        ).encode("utf-8")
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._last_cache_hash:
+            return
+        
+        # 先写临时文件再原子替换，进程中途退出也不会留下截断的缓存
+        tmp_file = self.cache_file.with_suffix(".json.tmp")
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.cache_file)
+            self._last_cache_hash = digest
         except Exception as e:
-            logger.error(f"Failed to save health cache: {e}")
+            logger.error("Failed to save health cache: %s", e)
+    
+    @staticmethod
+    def _config_view(model_config: ModelSpec) -> MutableMapping[str, Any]:
+        """
+        返回模型配置的可写字典视图
+        
+        调用方的修改（如 Provider 初始化时的 setdefault）写入独立的上层字典，
+        共享的模型配置不会被改动，也无需每次复制整个配置
+        """
+        return ChainMap({}, _spec_dict(model_config))
     
-    def get_llm_config(self) -> Dict[str, Any]:
+    def get_llm_config(self) -> MutableMapping[str, Any]:
         """获取当前 LLM 模型配置"""
-        if not self._available_llm:
-            # TTS-only 模式：返回一个占位配置，只有在真正调用 LLM 时才报错
-            logger.warning("LLM not configured. Will fail if LLM processing is requested.")
-            return {
-                "provider": "none",
-                "model": "none",
-                "api_key": None,
-                "base_url": None,
-            }
-        
-        if self._current_llm_index >= len(self._available_llm):
-            self._current_llm_index = 0
-        
-        return self._available_llm[self._current_llm_index]
-    
-    def get_tts_config(self) -> Dict[str, Any]:
+        self._maybe_refresh()
+        # 与后台复检对可用列表和索引的整体替换互斥
+        with self._state_lock:
+            models = self._available_llm
+            if models:
+                if self._current_llm_index >= len(models):
+                    self._current_llm_index = 0
+                return self._config_view(models[self._current_llm_index])
+        
+        # TTS-only 模式：返回一个占位配置，只有在真正调用 LLM 时才报错
+        logger.warning("LLM not configured. Will fail if LLM processing is requested.")
+        return {
+            "provider": "none",
+            "model": "none",
+            "api_key": None,
+            "base_url": None,
+        }
+    
+    def get_tts_config(self) -> MutableMapping[str, Any]:
         """获取当前 TTS 模型配置"""
-        if not self._available_tts:
-            raise RuntimeError("No TTS models available")
-        
-        if self._current_tts_index >= len(self._available_tts):
-            self._current_tts_index = 0
-        
-        return self._available_tts[self._current_tts_index]
+        self._maybe_refresh()
+        # 与后台复检对可用列表和索引的整体替换互斥
+        with self._state_lock:
+            models = self._available_tts
+            if models:
+                if self._current_tts_index >= len(models):
+                    self._current_tts_index = 0
+                return self._config_view(models[self._current_tts_index])
+        
+        raise RuntimeError("No TTS models available")
     
-    def switch_llm_model(self) -> Tuple[Dict[str, Any], bool]:
+    def switch_llm_model(self) -> Tuple[MutableMapping[str, Any], bool]:
         """
         切换到下一个可用的 LLM 模型
         
         Returns:
             (新配置, 是否成功切换)
         """
-        if len(self._available_llm) <= 1:
+        # 与后台复检对可用列表和索引的整体替换互斥
+        with self._state_lock:
+            models = self._available_llm
+            if len(models) > 1:
+                old_model = models[self._current_llm_index].model
+                self._current_llm_index = (self._current_llm_index + 1) % len(models)
+                new_config = models[self._current_llm_index]
+            else:
+                new_config = None
+        
+        if new_config is None:
             logger.error("No fallback LLM models available")
             return self.get_llm_config(), False
         
-        old_model = self._available_llm[self._current_llm_index]["model"]
-        self._current_llm_index = (self._current_llm_index + 1) % len(self._available_llm)
-        new_config = self._available_llm[self._current_llm_index]
-        
         logger.warning(
-            f"🔄 Switched LLM model from {old_model} to {new_config['model']}"
+            "🔄 Switched LLM model from %s to %s", old_model, new_config.model
         )
         
         self._save_cache()
-        return new_config, True
+        return self._config_view(new_config), True
     
-    def switch_tts_model(self) -> Tuple[Dict[str, Any], bool]:
+    def switch_tts_model(self) -> Tuple[MutableMapping[str, Any], bool]:
         """
         切换到下一个可用的 TTS 模型
         
         Returns:
             (新配置, 是否成功切换)
         """
-        if len(self._available_tts) <= 1:
+        # 与后台复检对可用列表和索引的整体替换互斥
+        with self._state_lock:
+            models = self._available_tts
+            if len(models) > 1:
+                old_provider = models[self._current_tts_index].provider
+                self._current_tts_index = (self._current_tts_index + 1) % len(models)
+                new_config = models[self._current_tts_index]
+            else:
+                new_config = None
+        
+        if new_config is None:
             logger.error("No fallback TTS models available")
             return self.get_tts_config(), False
         
-        old_provider = self._available_tts[self._current_tts_index]["provider"]
-        self._current_tts_index = (self._current_tts_index + 1) % len(self._available_tts)
-        new_config = self._available_tts[self._current_tts_index]
-        
         logger.warning(
-            f"🔄 Switched TTS provider from {old_provider} to {new_config['provider']}"
+            "🔄 Switched TTS provider from %s to %s",
+            old_provider,
+            new_config.provider,
         )
         
         self._save_cache()
-        return new_config, True
+        return self._config_view(new_config), True
     
-    def report_llm_failure(self) -> Dict[str, Any]:
+    def report_llm_failure(self) -> MutableMapping[str, Any]:
         """
         报告 LLM 模型故障，触发切换
         
         Returns:
             新的模型配置
         """
-        logger.error(f"❌ LLM model {self.get_llm_config()['model']} reported failure, switching...")
+        logger.error(
+            "❌ LLM model %s reported failure, switching...",
+            self.get_llm_config()["model"],
+        )
+        self._schedule_recheck("llm")
         new_config, success = self.switch_llm_model()
         
         if not success:
@@ -322,14 +690,18 @@ class ModelHealthChecker:
         
         return new_config
     
-    def report_tts_failure(self) -> Dict[str, Any]:
+    def report_tts_failure(self) -> MutableMapping[str, Any]:
         """
         报告 TTS 模型故障，触发切换
         
         Returns:
             新的模型配置
         """
-        logger.error(f"❌ TTS provider {self.get_tts_config()['provider']} reported failure, switching...")
+        logger.error(
+            "❌ TTS provider %s reported failure, switching...",
+            self.get_tts_config()["provider"],
+        )
+        self._schedule_recheck("tts")
         new_config, success = self.switch_tts_model()
         
         if not success:
@@ -337,6 +709,74 @@ class ModelHealthChecker:
         
         return new_config
     
+    def _schedule_recheck(self, model_type: str) -> None:
+        """在后台重新探测当前（报告故障的）模型"""
+        with self._state_lock:
+            models = self._available_llm if model_type == "llm" else self._available_tts
+            index = self._current_llm_index if model_type == "llm" else self._current_tts_index
+            if not models:
+                return
+            failed = models[index % len(models)]
+        try:
+            self._submit(self._recheck_failed, model_type, failed)
+        except RuntimeError:
+            # 线程池已关闭（close 之后），跳过复检
+            pass
+    
+    def _recheck_failed(self, model_type: str, config: ModelSpec) -> None:
+        """
+        重新探测报告故障的模型
+        
+        只探测这一个模型而不是全量复检；仍不可用则移出可用列表，
+        但保留最后一个模型，避免列表被清空
+        """
+        with self._cache_lock:
+            self._health_cache.pop(self._cache_key(model_type, config), None)
+        if self._check_model(model_type, config):
+            return
+        
+        index_attr = "_current_llm_index" if model_type == "llm" else "_current_tts_index"
+        models_attr = "_available_llm" if model_type == "llm" else "_available_tts"
+        with self._state_lock:
+            models = getattr(self, models_attr)
+            if config not in models or len(models) <= 1:
+                return
+            removed = models.index(config)
+            remaining = models[:removed] + models[removed + 1:]
+            current = getattr(self, index_attr)
+            if removed < current:
+                current -= 1
+            setattr(self, models_attr, remaining)
+            setattr(self, index_attr, current if current < len(remaining) else 0)
+        
+        logger.warning(
+            "❌ %s model %s still unavailable, removed from rotation",
+            model_type.upper(),
+            config.name,
+        )
+        self._save_cache()
+    
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """向探测线程池提交任务并记录，完成后自动移除"""
+        future = self._executor.submit(fn, *args)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+        return future
+    
+    def _discard_pending(self, future: Future) -> None:
+        with self._pending_lock:
+            self._pending.discard(future)
+    
+    def close(self) -> None:
+        """释放探测线程池和 HTTP 连接池，尚未开始的探测直接取消"""
+        with self._pending_lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        self._session.close()
+    
     def get_status(self) -> Dict[str, Any]:
         """获取健康检查状态"""
         return {
@@ -345,8 +785,8 @@ class ModelHealthChecker:
             "available_tts_count": len(self._available_tts),
             "current_llm": self.get_llm_config()["model"] if self._available_llm else None,
             "current_tts": self.get_tts_config()["provider"] if self._available_tts else None,
-            "all_llm_models": [m["model"] for m in self._available_llm],
-            "all_tts_models": [m["provider"] for m in self._available_tts]
+            "all_llm_models": [m.model for m in self._available_llm],
+            "all_tts_models": [m.provider for m in self._available_tts]
         }
 
 
@@ -9,8 +9,14 @@ Prompt 管理模块
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+
+# user_templates 中缺少对应模板时使用的最小化默认模板
+_DEFAULT_USER_TEMPLATE = "请将以下文章转换为播客脚本：\n\n标题：{title}\n\n内容：{content}"
 
 
 class PromptError(Exception):
@@ -28,6 +34,47 @@ class PromptKeyNotFoundError(PromptError):
     pass
 
 
+def _flatten(
+    node: Dict[str, Any],
+    prefix: str,
+    flat: Dict[str, Any]
+) -> None:
+    """把嵌套配置展开为点号分隔的键，中间层级的字典同样保留"""
+    for key, value in node.items():
+        if not isinstance(key, str):
+            continue
+        dotted = f"{prefix}{key}"
+        flat[dotted] = value
+        if isinstance(value, dict):
+            _flatten(value, f"{dotted}.", flat)
+
+
+@lru_cache(maxsize=8)
+def _parse_prompts(
+    path: str,
+    mtime_ns: int
+) -> Tuple[Dict[str, Any], Mapping[str, Any]]:
+    """
+    解析 Prompt 配置文件
+    
+    按 (路径, 修改时间) 缓存：同一文件只解析一次，文件修改后自动重新解析。
+    返回的配置被所有 PromptManager 实例共享，调用方不得修改
+    
+    Returns:
+        (原始嵌套配置, 点号键 -> 值 的只读索引)
+    """
+    import yaml
+    # 优先使用 libyaml 的 C 实现，未编译 libyaml 时回退到纯 Python 实现
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        prompts = yaml.load(f, Loader=loader) or {}
+    
+    flat: Dict[str, Any] = {}
+    if isinstance(prompts, dict):
+        _flatten(prompts, "", flat)
+    return prompts, MappingProxyType(flat)
+
+
 class PromptManager:
     """
     Prompt 管理器
@@ -50,6 +97,10 @@ class PromptManager:
         """
         self._prompts_file = Path(prompts_file)
         self._prompts: Dict[str, Any] = {}
+        self._flat: Mapping[str, Any] = MappingProxyType({})
+        # template_key -> 解析后的用户模板（含默认模板回退）
+        self._template_cache: Dict[str, str] = {}
+        self._mtime_ns = 0
         self._load_prompts()
     
     def _load_prompts(self) -> None:
@@ -59,10 +110,13 @@ class PromptManager:
                 f"Prompt file not found: {self._prompts_file}"
             )
         
+        import yaml
+        self._mtime_ns = self._prompts_file.stat().st_mtime_ns
         try:
-            import yaml
-            with open(self._prompts_file, 'r', encoding='utf-8') as f:
-                self._prompts = yaml.safe_load(f) or {}
+            self._prompts, self._flat = _parse_prompts(
+                str(self._prompts_file.resolve()),
+                self._mtime_ns
+            )
         except yaml.YAMLError as e:
             raise PromptError(f"Invalid YAML format in {self._prompts_file}: {e}")
     
@@ -77,16 +131,7 @@ class PromptManager:
         Returns:
             Prompt 值，不存在返回 default
         """
-        keys = key.split('.')
-        value = self._prompts
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     def get_required(self, key: str) -> Any:
         """
@@ -130,14 +175,15 @@ class PromptManager:
         Returns:
             格式化后的 Prompt
         """
-        template = self.get(f"user_templates.{template_key}")
-        
-        if not template:
-            # 返回最小化的默认模板
-            template = "请将以下文章转换为播客脚本：\n\n标题：{title}\n\n内容：{content}"
+        template = self._template_cache.get(template_key)
+        if template is None:
+            template = (
+                self.get(f"user_templates.{template_key}") or _DEFAULT_USER_TEMPLATE
+            )
+            self._template_cache[template_key] = template
         
         try:
-            return template.format(**kwargs)
+            return template.format_map(kwargs)
         except KeyError as e:
             raise PromptError(f"Missing template variable: {e}")
     
@@ -167,7 +213,7 @@ class PromptManager:
         message = self.get(f"system_messages.{message_key}", "")
         if message and kwargs:
             try:
-                return message.format(**kwargs)
+                return message.format_map(kwargs)
             except KeyError:
                 return message
         return message
@@ -178,18 +224,37 @@ class PromptManager:
         return self._prompts_file
 
 
+# 配置文件路径 -> PromptManager 实例
+_prompt_managers: Dict[str, PromptManager] = {}
+
+
 def get_prompt_manager(
     prompts_file: Union[str, Path] = "prompts/prompts.yaml"
 ) -> PromptManager:
     """
-    获取 Prompt 管理器实例（工厂函数）
+    获取 Prompt 管理器实例
     
-    每次调用都创建新实例，避免单例问题
+    每个配置文件复用同一实例；文件修改时间变化后重新创建，
+    修改 prompts.yaml 无需重启即可生效
     
     Args:
         prompts_file: 配置文件路径
         
     Returns:
         PromptManager 实例
+        
+    Raises:
+        PromptFileNotFoundError: 配置文件不存在
     """
-    return PromptManager(prompts_file)
+    path = Path(prompts_file)
+    key = str(path)
+    manager = _prompt_managers.get(key)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    
+    if manager is None or manager._mtime_ns != mtime_ns:
+        manager = PromptManager(path)
+        _prompt_managers[key] = manager
+    return manager
@@ -3,7 +3,8 @@ Provider 工厂类
 用于创建和管理不同的 LLM Provider
 """
 
-from typing import Dict, Any, Optional
+import importlib
+from typing import Dict, Any, Optional, Tuple
 from .base_provider import BaseProvider
 
 
@@ -17,6 +18,9 @@ class ProviderFactory:
     # 注册的 Provider 类
     _providers: Dict[str, Any] = {}
     
+    # 延迟注册的 Provider：名称 -> (模块路径, 类名)，首次创建时才导入模块
+    _lazy_providers: Dict[str, Tuple[str, str]] = {}
+    
     @classmethod
     def register(cls, name: str, provider_class):
         """
@@ -27,6 +31,42 @@ class ProviderFactory:
             provider_class: Provider 类（必须继承 BaseProvider）
         """
         cls._providers[name.lower()] = provider_class
+        cls._lazy_providers.pop(name.lower(), None)
+    
+    @classmethod
+    def register_lazy(cls, name: str, module_path: str, class_name: str):
+        """
+        延迟注册 Provider，模块（及其依赖的 SDK）在首次创建时才导入
+        
+        Args:
+            name: Provider 名称标识
+            module_path: 模块路径，相对路径以本包为基准（如 '.nvidia_provider'）
+            class_name: Provider 类名
+        """
+        cls._lazy_providers[name.lower()] = (module_path, class_name)
+    
+    @classmethod
+    def _resolve(cls, provider_name: str) -> Optional[Any]:
+        """获取 Provider 类，延迟注册的在此时导入并缓存"""
+        provider_class = cls._providers.get(provider_name)
+        if provider_class is not None:
+            return provider_class
+        
+        lazy = cls._lazy_providers.get(provider_name)
+        if lazy is None:
+            return None
+        
+        module_path, class_name = lazy
+        try:
+            module = importlib.import_module(module_path, __name__)
+        except ImportError as e:
+            raise ValueError(
+                f"Failed to load provider '{provider_name}': {e}"
+            ) from e
+        
+        provider_class = getattr(module, class_name)
+        cls._providers[provider_name] = provider_class
+        return provider_class
     
     @classmethod
     def create(cls, provider_name: str, config: Dict[str, Any]) -> BaseProvider:
@@ -45,14 +85,14 @@ class ProviderFactory:
         """
         provider_name = provider_name.lower()
         
-        if provider_name not in cls._providers:
-            available = ', '.join(cls._providers.keys())
+        provider_class = cls._resolve(provider_name)
+        if provider_class is None:
+            available = ', '.join(cls.get_available_providers())
             raise ValueError(
                 f"Unknown provider: '{provider_name}'. "
                 f"Available providers: {available}"
             )
         
-        provider_class = cls._providers[provider_name]
         return provider_class(config)
     
     @classmethod
@@ -63,30 +103,22 @@ class ProviderFactory:
         Returns:
             list: Provider 名称列表
         """
-        return list(cls._providers.keys())
+        return list(dict.fromkeys([*cls._lazy_providers, *cls._providers]))
     
     @classmethod
     def auto_register(cls):
         """
         自动注册内置的 Provider
         
-        在导入时自动调用，注册所有内置 Provider
+        在导入时自动调用，注册所有内置 Provider。
+        内置 Provider 均为延迟注册，只有真正使用时才导入对应的 SDK
         """
         # 避免重复注册
-        if cls._providers:
+        if cls._providers or cls._lazy_providers:
             return
         
-        try:
-            from .nvidia_provider import NvidiaProvider
-            cls.register('nvidia', NvidiaProvider)
-        except ImportError as e:
-            print(f"Warning: Failed to register NVIDIA provider: {e}")
-        
-        try:
-            from .openai_provider import OpenAIProvider
-            cls.register('openai', OpenAIProvider)
-        except ImportError as e:
-            print(f"Warning: Failed to register OpenAI provider: {e}")
+        cls.register_lazy('nvidia', '.nvidia_provider', 'NvidiaProvider')
+        cls.register_lazy('openai', '.openai_provider', 'OpenAIProvider')
 
 
 # 自动注册内置 Provider
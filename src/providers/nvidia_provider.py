@@ -3,11 +3,19 @@ NVIDIA Provider 实现
 使用 NVIDIA API 进行 LLM 推理
 """
 
+import re
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, List, Optional
 from .base_provider import BaseProvider
+from .. import json_utils
 from ..retry_utils import api_retry
 
+# token 估算用的字符分类（汉字按连续片段匹配，片段长度之和即汉字数）
+_CHINESE_RUN_RE = re.compile(r"[\u4e00-\u9fff]+")
+_ENGLISH_WORD_RE = re.compile(r"[a-zA-Z]+")
+
 
 class NvidiaProvider(BaseProvider):
     """
@@ -37,6 +45,13 @@ class NvidiaProvider(BaseProvider):
         "google/gemma-2-9b-it",
     ]
 
+    # 已知模型集合，用于 validate_config 的成员检查
+    _KNOWN_MODELS = frozenset(AVAILABLE_MODELS)
+
+    # 所有实例共享的 HTTP 会话（keep-alive 连接池），首次请求时创建
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 NVIDIA Provider
@@ -64,6 +79,10 @@ class NvidiaProvider(BaseProvider):
         self.top_p = self.config.get("top_p", 0.95)
         self.stream = self.config.get("stream", False)
 
+        # 每次请求都相同的部分，初始化时构建一次
+        self._completions_url = f"{self.base_url}/chat/completions"
+        self._auth_headers = {"Authorization": f"Bearer {self.api_key}"}
+
     def validate_config(self) -> bool:
         """
         验证 NVIDIA 配置
@@ -83,7 +102,7 @@ class NvidiaProvider(BaseProvider):
             raise ValueError("Model name is required. Set it in config['model'].")
 
         # 验证模型是否在可用列表中（警告但不阻止）
-        if self.model not in self.AVAILABLE_MODELS:
+        if self.model not in self._KNOWN_MODELS:
             print(
                 f"Warning: Model '{self.model}' is not in the known models list. "
                 f"Available models: {', '.join(self.AVAILABLE_MODELS[:5])}..."
@@ -91,6 +110,36 @@ class NvidiaProvider(BaseProvider):
 
         return True
 
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """
+        获取共享的 HTTP 会话
+
+        同一主机的重复请求复用已建立的 TCP/TLS 连接，无需每次重新握手
+        """
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    session.mount(
+                        "https://",
+                        HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0),
+                    )
+                    session.headers.update({
+                        "Accept": "application/json",
+                        "Content-Type": "application/json",
+                    })
+                    cls._session = session
+        return cls._session
+
+    @classmethod
+    def close_session(cls) -> None:
+        """关闭共享的 HTTP 会话，释放连接池"""
+        with cls._session_lock:
+            if cls._session is not None:
+                cls._session.close()
+                cls._session = None
+
     @api_retry
     def chat_completion(
         self, messages: List[Dict[str, str]], **kwargs
@@ -106,9 +155,6 @@ class NvidiaProvider(BaseProvider):
             Dict: 包含 success, content, tokens_used, error 等字段
         """
         try:
-            # 构建请求 URL
-            url = f"{self.base_url}/chat/completions"
-
             # 构建请求体
             payload = {
                 "model": kwargs.get("model", self.model),
@@ -123,23 +169,19 @@ class NvidiaProvider(BaseProvider):
             if "seed" in kwargs:
                 payload["seed"] = kwargs["seed"]
 
-            # 构建请求头
-            headers = {
-                "Accept": "application/json",
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}",
-            }
-
-            # 发送请求
-            response = requests.post(
-                url, json=payload, headers=headers, timeout=self.timeout
+            # 发送请求（请求体预先序列化为字节；Accept/Content-Type 已是会话默认头）
+            response = self._get_session().post(
+                self._completions_url,
+                data=json_utils.dumps(payload),
+                headers=self._auth_headers,
+                timeout=self.timeout,
             )
 
             # 检查响应状态
             response.raise_for_status()
 
-            # 解析响应
-            data = response.json()
+            # 解析响应（直接解析原始字节，省去解码和标准库解析开销）
+            data = json_utils.loads(response.content)
 
             # 提取生成的内容
             if "choices" in data and len(data["choices"]) > 0:
@@ -171,7 +213,7 @@ class NvidiaProvider(BaseProvider):
         except requests.exceptions.HTTPError as e:
             error_msg = f"HTTP error: {e.response.status_code}"
             try:
-                error_data = e.response.json()
+                error_data = json_utils.loads(e.response.content)
                 if "error" in error_data:
                     error_msg += f" - {error_data['error']}"
             except:
@@ -210,11 +252,9 @@ class NvidiaProvider(BaseProvider):
         # 对于中文文本，DeepSeek 和 Llama 模型通常使用 BPE tokenizer
         # 粗略估算：每个汉字约 1-2 tokens，英文单词约 1.3 tokens
 
-        import re
-
         # 分离中英文
-        chinese_chars = len(re.findall(r"[\u4e00-\u9fff]", text))
-        english_words = len(re.findall(r"[a-zA-Z]+", text))
+        chinese_chars = sum(map(len, _CHINESE_RUN_RE.findall(text)))
+        english_words = len(_ENGLISH_WORD_RE.findall(text))
         other_chars = len(text) - chinese_chars - english_words
 
         # 估算：中文 1.5 tokens/字，英文 1.3 tokens/词，其他 0.5 tokens/字符
@@ -3,7 +3,8 @@ OpenAI Provider 实现
 支持 OpenAI API 和兼容 OpenAI 格式的 API(如 DeepSeek、Azure 等)
 """
 
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from .base_provider import BaseProvider
 from ..retry_utils import api_retry
 
@@ -19,6 +20,11 @@ class OpenAIProvider(BaseProvider):
     - 其他 OpenAI 格式兼容的 API
     """
 
+    # 进程内共享的客户端，按 (base_url, api_key) 区分；
+    # 新建的 Provider 实例复用已有客户端及其 keep-alive 连接池
+    _clients: Dict[Tuple[Optional[str], Optional[str]], Any] = {}
+    _clients_lock = threading.Lock()
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 OpenAI Provider
@@ -42,23 +48,51 @@ class OpenAIProvider(BaseProvider):
         self._client = None
 
     def _get_client(self):
-        """获取或创建 OpenAI 客户端"""
+        """获取或创建 OpenAI 客户端（同一端点和密钥的实例共享）"""
         if self._client is None:
-            try:
-                from openai import OpenAI
-
-                client_kwargs = {"api_key": self.api_key}
-                if self.base_url:
-                    client_kwargs["base_url"] = self.base_url
-
-                self._client = OpenAI(**client_kwargs)
-            except ImportError:
-                raise ImportError(
-                    "OpenAI package is required. Install it with: pip install openai"
-                )
+            key = (self.base_url, self.api_key)
+            with self._clients_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    try:
+                        import httpx
+                        from openai import OpenAI
+                    except ImportError:
+                        raise ImportError(
+                            "OpenAI package is required. Install it with: pip install openai"
+                        )
+
+                    client_kwargs = {
+                        "api_key": self.api_key,
+                        # 自建 httpx 客户端（openai 较早的 1.x 版本没有 DefaultHttpxClient），
+                        # 超时与重定向设置与 SDK 默认值一致
+                        "http_client": httpx.Client(
+                            timeout=httpx.Timeout(600.0, connect=5.0),
+                            limits=httpx.Limits(
+                                max_keepalive_connections=8,
+                                max_connections=16,
+                                keepalive_expiry=30.0,
+                            ),
+                            follow_redirects=True,
+                        ),
+                    }
+                    if self.base_url:
+                        client_kwargs["base_url"] = self.base_url
+
+                    client = OpenAI(**client_kwargs)
+                    self._clients[key] = client
+            self._client = client
 
         return self._client
 
+    @classmethod
+    def close_clients(cls) -> None:
+        """关闭所有共享客户端，释放连接池"""
+        with cls._clients_lock:
+            for client in cls._clients.values():
+                client.close()
+            cls._clients.clear()
+
     def validate_config(self) -> bool:
         """
         验证 OpenAI 配置
@@ -6,11 +6,21 @@ Generates QR codes for episode and feed links
 import io
 import qrcode
 import base64
+import threading
+from functools import lru_cache
 from typing import Optional
 from .logger import get_logger
 
+try:
+    import segno
+except ImportError:  # segno is optional, fall back to qrcode + PIL
+    segno = None
+
 logger = get_logger("qrcode_utils")
 
+# Per-thread QRCode instance reused across renders (qrcode fallback path only)
+_local = threading.local()
+
 
 def generate_qrcode_base64(
     url: str, box_size: int = 10, border: int = 4
@@ -19,25 +29,59 @@ def generate_qrcode_base64(
     Generate a QR code image as a base64 encoded PNG string
     """
     try:
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=box_size,
-            border=border,
-        )
+        return _render_qrcode_data_url(url, box_size, border)
+    except Exception as e:
+        logger.error(f"Error generating QR code for {url}", error=e)
+        return None
+
+
+@lru_cache(maxsize=512)
+def _render_qrcode_data_url(url: str, box_size: int, border: int) -> str:
+    """
+    Render a QR code as a PNG data URL, cached per (url, box_size, border)
+
+    Errors are raised, so failures are never cached
+    """
+    buffered = io.BytesIO()
+
+    if segno is not None:
+        # segno writes the PNG itself without building a PIL image
+        qr = segno.make_qr(url, error="l")
+        qr.save(buffered, kind="png", scale=box_size, border=border)
+    else:
+        qr = _get_qrcode(box_size, border)
         qr.add_data(url)
         qr.make(fit=True)
 
         img = qr.make_image(fill_color="black", back_color="white")
-
-        buffered = io.BytesIO()
         img.save(buffered, format="PNG")
-        img_str = base64.b64encode(buffered.getvalue()).decode("utf-8")
 
-        return f"data:image/png;base64,{img_str}"
-    except Exception as e:
-        logger.error(f"Error generating QR code for {url}", error=e)
-        return None
+    # getbuffer() exposes the PNG bytes without copying; base64 output is pure ASCII
+    img_str = base64.b64encode(buffered.getbuffer()).decode("ascii")
+
+    return f"data:image/png;base64,{img_str}"
+
+
+def _get_qrcode(box_size: int, border: int) -> qrcode.QRCode:
+    """
+    Get a cleared QRCode instance for the current thread
+
+    A new instance is created when box_size or border differ from the cached one
+    """
+    qr = getattr(_local, "qr", None)
+    if qr is None or qr.box_size != box_size or qr.border != border:
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=box_size,
+            border=border,
+        )
+        _local.qr = qr
+    else:
+        qr.clear()
+        # make(fit=True) grows the version in place; start each fit from 1 again
+        qr.version = 1
+    return qr
 
 
 def generate_feed_qr_payload(rss_url: str) -> dict:
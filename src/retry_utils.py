@@ -7,10 +7,13 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
+    retry_if_exception,
     retry_if_exception_type,
     before_sleep_log,
 )
+import sys
 import logging
+import requests
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +27,46 @@ network_retry = retry(
 )
 
 
+# Transport-level failures that are worth another attempt
+_RETRYABLE_EXCEPTIONS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+# Transport failures of optional HTTP clients, as (module, class) pairs.
+# They are looked up only once the module is loaded, so this module never
+# imports the SDKs itself (openai.APITimeoutError subclasses APIConnectionError).
+_RETRYABLE_OPTIONAL_EXCEPTIONS = (
+    ("openai", "APIConnectionError"),
+    ("httpx", "TransportError"),
+)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """
+    Whether an API call failure is transient
+
+    Network errors, timeouts, 5xx responses and 429 rate limits are retried;
+    anything else (bad requests, auth errors, programming bugs) fails fast.
+    """
+    if isinstance(exc, _RETRYABLE_EXCEPTIONS):
+        return True
+    for module_name, class_name in _RETRYABLE_OPTIONAL_EXCEPTIONS:
+        error_type = getattr(sys.modules.get(module_name), class_name, None)
+        if isinstance(error_type, type) and isinstance(exc, error_type):
+            return True
+
+    # HTTP errors carry the response (requests and the OpenAI SDK alike)
+    status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    return status_code is not None and (status_code >= 500 or status_code == 429)
+
+
 api_retry = retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=2, min=2, max=30),
-    retry=retry_if_exception_type((ConnectionError, TimeoutError, Exception)),
+    retry=retry_if_exception(_is_retryable),
     before_sleep=before_sleep_log(logger, logging.WARNING),
     reraise=True,
 )
@@ -3,11 +3,121 @@ RSS Feed 生成模块
 生成播客的 RSS XML 文件
 """
 
+import hashlib
+import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from xml.etree.ElementTree import Element, ElementTree, SubElement, tostring
+
+try:
+    from xml.etree.ElementTree import indent
+except ImportError:  # Python 3.8
+
+    def indent(tree: Element, space: str = "  ", level: int = 0) -> None:
+        """原地缩进元素树（ElementTree.indent 从 Python 3.9 开始提供）"""
+        if not len(tree):
+            return
+        child_indent = "\n" + space * (level + 1)
+        if not tree.text or not tree.text.strip():
+            tree.text = child_indent
+        for child in tree:
+            indent(child, space, level + 1)
+            if not child.tail or not child.tail.strip():
+                child.tail = child_indent
+        if not child.tail.strip():
+            child.tail = "\n" + space * level
+
+
+# 输出文件按 UTF-8 写入
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+# RFC 822 日期中的星期与月份缩写
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = (
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+)
+
+# 音频格式对应的 MIME 类型
+_MIME_TYPES = {
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "mp4": "audio/mp4",
+    "aac": "audio/aac",
+    "ogg": "audio/ogg",
+    "opus": "audio/ogg",
+}
+
+
+# 元素描述：(标签, 文本, 属性, 子元素描述)，不可变，可在线程间共享
+_ElementSpec = Tuple[str, Optional[str], Tuple[Tuple[str, str], ...], tuple]
+
+
+@lru_cache(maxsize=16)
+def _channel_info_specs(
+    title: str,
+    base_url: str,
+    description: str,
+    language: str,
+    author: str,
+    category: str,
+    cover_image: str,
+) -> Tuple[_ElementSpec, ...]:
+    """
+    描述 channel 中与生成时间无关的播客信息元素
+
+    缓存的是不可变的元素描述，每个 RSS 树由 _append_elements 构建各自的元素
+    """
+    specs = [
+        # 必填字段
+        ("title", title, (), ()),
+        ("link", base_url, (), ()),
+        ("description", description, (), ()),
+        ("language", language, (), ()),
+        # iTunes 特有字段
+        ("itunes:author", author, (), ()),
+        ("itunes:category", None, (("text", category),), ()),
+        ("itunes:explicit", "false", (), ()),
+    ]
+
+    # 封面图片
+    if cover_image:
+        image_url = f"{base_url}/{cover_image}"
+        specs.append(("itunes:image", None, (("href", image_url),), ()))
+        specs.append(
+            (
+                "image",
+                None,
+                (),
+                (
+                    ("url", image_url, (), ()),
+                    ("title", title, (), ()),
+                    ("link", base_url, (), ()),
+                ),
+            )
+        )
+
+    return tuple(specs)
+
+
+def _append_elements(parent: Element, specs: Tuple[_ElementSpec, ...]) -> None:
+    """按元素描述在 parent 下创建子元素"""
+    for tag, text, attrib, children in specs:
+        element = SubElement(parent, tag, dict(attrib))
+        element.text = text
+        _append_elements(element, children)
 
 
 class RSSGenerator:
@@ -29,6 +139,11 @@ class RSSGenerator:
         Returns:
             str: RSS XML 字符串
         """
+        rss = self._build_rss(episodes)
+        return _XML_DECLARATION + tostring(rss, encoding="unicode")
+
+    def _build_rss(self, episodes: List[Dict[str, Any]]) -> Element:
+        """构建已缩进的 RSS 元素树"""
         # 创建根元素
         rss = Element("rss")
         rss.set("version", "2.0")
@@ -38,73 +153,73 @@ class RSSGenerator:
         # 创建 channel
         channel = SubElement(rss, "channel")
 
+        # 所有条目共用的字段只计算一次
+        base_url = self.podcast.get("base_url", "")
+        author = self.podcast.get("author", "GhostRadio")
+        mime_type = self._get_mime_type(self.resources.get("audio_format", "m4a"))
+        now = self._format_rfc822_date(datetime.now())
+
         # 添加播客基本信息
-        self._add_podcast_info(channel)
+        self._add_podcast_info(channel, now)
 
-        # 添加节目条目
+        # 添加节目条目（同一 ID 只保留第一次出现的条目，避免 GUID 重复）
+        seen_ids = set()
         for episode in episodes:
-            self._add_episode(channel, episode)
-
-        # 格式化 XML
-        xml_string = tostring(rss, encoding="unicode")
-        dom = minidom.parseString(xml_string)
-        pretty_xml = dom.toprettyxml(indent="  ")
-
-        # 移除空行
-        lines = [line for line in pretty_xml.split("\n") if line.strip()]
-        return "\n".join(lines)
-
-    def _add_podcast_info(self, channel: Element):
+            episode_id = episode.get("id")
+            if episode_id:
+                if episode_id in seen_ids:
+                    continue
+                seen_ids.add(episode_id)
+            self._add_episode(channel, episode, base_url, author, mime_type, now)
+
+        # 原地缩进，序列化时无需重新解析
+        indent(rss, space="  ")
+        return rss
+
+    def _add_podcast_info(self, channel: Element, last_build_date: str):
         """添加播客基本信息"""
-        # 必填字段
-        title = SubElement(channel, "title")
-        title.text = self.podcast.get("title", "GhostRadio")
-
-        link = SubElement(channel, "link")
-        link.text = self.podcast.get("base_url", "")
-
-        description = SubElement(channel, "description")
-        description.text = self.podcast.get("description", "AI Generated Podcast")
-
-        language = SubElement(channel, "language")
-        language.text = self.podcast.get("language", "zh-CN")
-
-        # iTunes 特有字段
-        itunes_author = SubElement(channel, "itunes:author")
-        itunes_author.text = self.podcast.get("author", "GhostRadio")
-
-        itunes_category = SubElement(channel, "itunes:category")
-        itunes_category.set("text", self.podcast.get("category", "Technology"))
-
-        itunes_explicit = SubElement(channel, "itunes:explicit")
-        itunes_explicit.text = "false"
-
-        # 封面图片
-        cover_image = self.podcast.get("cover_image", "cover.jpg")
-        if cover_image:
-            itunes_image = SubElement(channel, "itunes:image")
-            itunes_image.set(
-                "href", f"{self.podcast.get('base_url', '')}/{cover_image}"
+        # 不随生成时间变化的字段按配置缓存，同一进程内多次生成时复用
+        _append_elements(
+            channel,
+            _channel_info_specs(
+                self.podcast.get("title", "GhostRadio"),
+                self.podcast.get("base_url", ""),
+                self.podcast.get("description", "AI Generated Podcast"),
+                self.podcast.get("language", "zh-CN"),
+                self.podcast.get("author", "GhostRadio"),
+                self.podcast.get("category", "Technology"),
+                self.podcast.get("cover_image", "cover.jpg"),
             )
-
-            image = SubElement(channel, "image")
-            image_url = SubElement(image, "url")
-            image_url.text = f"{self.podcast.get('base_url', '')}/{cover_image}"
-            image_title = SubElement(image, "title")
-            image_title.text = self.podcast.get("title", "GhostRadio")
-            image_link = SubElement(image, "link")
-            image_link.text = self.podcast.get("base_url", "")
+        )
 
         # 最后生成时间
         last_build = SubElement(channel, "lastBuildDate")
-        last_build.text = self._format_rfc822_date(datetime.now())
+        last_build.text = last_build_date
 
         # 生成器
         generator = SubElement(channel, "generator")
         generator.text = "GhostRadio"
 
-    def _add_episode(self, channel: Element, episode: Dict[str, Any]):
-        """添加单个节目条目"""
+    def _add_episode(
+        self,
+        channel: Element,
+        episode: Dict[str, Any],
+        base_url: str,
+        author: str,
+        mime_type: str,
+        default_pub_date: str,
+    ):
+        """
+        添加单个节目条目
+
+        Args:
+            channel: channel 元素
+            episode: 节目信息
+            base_url: 播客基础 URL
+            author: 作者
+            mime_type: 音频 MIME 类型
+            default_pub_date: 节目没有创建时间时使用的发布日期
+        """
         item = SubElement(channel, "item")
 
         # 标题
@@ -127,7 +242,7 @@ class RSSGenerator:
         if isinstance(created, datetime):
             pub_date.text = self._format_rfc822_date(created)
         else:
-            pub_date.text = self._format_rfc822_date(datetime.now())
+            pub_date.text = default_pub_date
 
         # GUID (全局唯一标识符)
         guid = SubElement(item, "guid")
@@ -140,7 +255,6 @@ class RSSGenerator:
             enclosure = SubElement(item, "enclosure")
 
             # 构建完整 URL
-            base_url = self.podcast.get("base_url", "")
             audio_filename = os.path.basename(audio_file)
             audio_url = f"{base_url}/episodes/{self.user_id}/{audio_filename}"
             enclosure.set("url", audio_url)
@@ -150,8 +264,6 @@ class RSSGenerator:
             enclosure.set("length", str(int(size_bytes)))
 
             # MIME 类型
-            audio_format = self.resources.get("audio_format", "m4a")
-            mime_type = self._get_mime_type(audio_format)
             enclosure.set("type", mime_type)
 
             # 时长 (iTunes)
@@ -162,39 +274,22 @@ class RSSGenerator:
 
         # iTunes 特有字段
         itunes_author = SubElement(item, "itunes:author")
-        itunes_author.text = self.podcast.get("author", "GhostRadio")
+        itunes_author.text = author
 
         itunes_explicit = SubElement(item, "itunes:explicit")
         itunes_explicit.text = "false"
 
     def _format_rfc822_date(self, dt: datetime) -> str:
         """格式化日期为 RFC 822 格式"""
-        days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        months = [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ]
-
-        day_name = days[dt.weekday()]
-        month_name = months[dt.month - 1]
+        day_name = _DAYS[dt.weekday()]
+        month_name = _MONTHS[dt.month - 1]
 
         return f"{day_name}, {dt.day:02d} {month_name} {dt.year} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d} +0000"
 
     def _format_duration(self, seconds: float) -> str:
         """格式化时长为 HH:MM:SS 格式"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        hours, rem = divmod(int(seconds), 3600)
+        minutes, secs = divmod(rem, 60)
 
         if hours > 0:
             return f"{hours}:{minutes:02d}:{secs:02d}"
@@ -203,15 +298,7 @@ class RSSGenerator:
 
     def _get_mime_type(self, audio_format: str) -> str:
         """获取音频格式的 MIME 类型"""
-        mime_types = {
-            "mp3": "audio/mpeg",
-            "m4a": "audio/mp4",
-            "mp4": "audio/mp4",
-            "aac": "audio/aac",
-            "ogg": "audio/ogg",
-            "opus": "audio/ogg",
-        }
-        return mime_types.get(audio_format.lower(), "audio/mpeg")
+        return _MIME_TYPES.get(audio_format.lower(), "audio/mpeg")
 
     def save_rss(self, episodes: List[Dict[str, Any]], output_path: str = None):
         """
@@ -227,11 +314,42 @@ class RSSGenerator:
         # 确保目录存在
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+        # 节目列表和播客配置都没变时，已有的 feed 无需重新生成
+        content_hash = self._content_hash(episodes)
+        hash_path = output_path + ".hash"
+        if os.path.exists(output_path):
+            try:
+                with open(hash_path, "r", encoding="utf-8") as f:
+                    if f.read() == content_hash:
+                        return output_path
+            except OSError:
+                pass
+
         # 生成 RSS
-        rss_content = self.generate(episodes)
+        rss = self._build_rss(episodes)
+
+        # 边序列化边写入文件，不在内存中拼出完整的 XML 字符串
+        with open(output_path, "wb") as f:
+            f.write(_XML_DECLARATION.encode("utf-8"))
+            ElementTree(rss).write(f, encoding="utf-8", xml_declaration=False)
 
-        # 保存文件
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(rss_content)
+        # feed 写完后再记录指纹，写入中断时下次会重新生成
+        with open(hash_path, "w", encoding="utf-8") as f:
+            f.write(content_hash)
 
         return output_path
+
+    def _content_hash(self, episodes: List[Dict[str, Any]]) -> str:
+        """计算决定 feed 内容的输入（节目列表与相关配置）的指纹"""
+        payload = json.dumps(
+            [
+                self.podcast,
+                self.resources.get("audio_format", "m4a"),
+                self.user_id,
+                episodes,
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
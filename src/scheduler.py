@@ -6,7 +6,6 @@ GhostRadio Scheduler - 调度脚本
 
 import os
 import sys
-import subprocess
 import argparse
 from pathlib import Path
 
@@ -17,37 +16,24 @@ sys.path.insert(0, str(project_root))
 from src.config import get_config
 
 
-def run_worker(nice_level: int = 19):
+def run_worker(nice_level: int = 19) -> bool:
     """
-    运行 Worker 进程
+    在当前进程中运行一次 Worker
     
     Args:
         nice_level: CPU 优先级 (19 为最低)
     """
-    worker_script = project_root / 'src' / 'worker.py'
-    
-    if not worker_script.exists():
-        print(f"Error: Worker script not found: {worker_script}")
-        return False
-    
     try:
-        # 使用 nice 命令降低优先级
-        cmd = ['nice', '-n', str(nice_level), sys.executable, str(worker_script), '--once']
+        # 调度器此后只剩 Worker 的工作，直接降低本进程的优先级
+        os.nice(nice_level)
+        
+        # 延迟导入：队列为空时无需加载 Worker 及其依赖
+        from src.worker import Worker
         
-        print(f"Running: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        Worker().run()
+        print("Worker completed successfully")
+        return True
         
-        if result.returncode == 0:
-            print("Worker completed successfully")
-            if result.stdout:
-                print(result.stdout)
-            return True
-        else:
-            print(f"Worker failed with code {result.returncode}")
-            if result.stderr:
-                print(f"Error: {result.stderr}")
-            return False
-            
     except Exception as e:
         print(f"Error running worker: {e}")
         return False
@@ -60,14 +46,11 @@ def check_queue() -> bool:
         paths = config.get_paths_config()
         queue_file = paths['queue_file']
         
-        if not os.path.exists(queue_file):
-            return False
-        
-        with open(queue_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-        
-        return len(content) > 0
+        # 只看文件大小，不读取队列内容
+        return os.stat(queue_file).st_size > 0
         
+    except FileNotFoundError:
+        return False
     except Exception as e:
         print(f"Error checking queue: {e}")
         return False
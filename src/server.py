@@ -5,12 +5,16 @@ GhostRadio Trigger Server - 极简 Webhook 接收器
 """
 
 import os
+import re
 import sys
-import json
+import time
+import socket
 import argparse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 
 # 添加项目根目录到 Python 路径
@@ -18,9 +22,84 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src import json_utils
 from src.config import get_config
 from src.api_routes import handle_api_request
 
+# POST 请求体上限，超过时在读取前直接拒绝
+MAX_BODY_BYTES = 64 * 1024
+
+# 静态文件目录，只提供该目录内的文件
+STATIC_ROOT = Path("episodes")
+
+# 前端页面
+INDEX_PAGE_PATH = STATIC_ROOT / "index.html"
+
+# Webhook 接受的 URL：http(s) 开头、不含空白、长度有限
+_URL_RE = re.compile(r"https?://\S{1,2000}\Z")
+
+# 单段字节范围，如 bytes=0-1023、bytes=1024-、bytes=-512
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# 静态文件扩展名对应的 Content-Type，未列出的按 application/octet-stream 发送
+CONTENT_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.html': 'text/html',
+    '.css': 'text/css',
+    '.js': 'application/javascript',
+}
+
+# 静态文件的 Cache-Control：音频文件生成后不再修改，允许浏览器缓存；
+# 其他文件每次用 ETag 验证
+CACHE_CONTROL = {
+    '.mp3': 'public, max-age=3600',
+}
+DEFAULT_CACHE_CONTROL = 'no-cache'
+
+
+def make_etag(st: os.stat_result) -> str:
+    """根据文件大小和修改时间生成 ETag"""
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    解析 Range 请求头
+
+    Args:
+        header: Range 请求头的值
+        size: 文件大小
+
+    Returns:
+        请求的闭区间 (start, end)；无法识别（包括多段范围）时返回 None，按完整文件响应
+
+    Raises:
+        ValueError: 范围不可满足
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            raise ValueError("Range start beyond end of file")
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # 后缀范围：最后 N 个字节
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        start = max(0, size - suffix)
+        end = size - 1
+    else:
+        return None
+
+    return start, end
+
 
 def get_server_config() -> Dict[str, Any]:
     """从配置文件获取服务器配置"""
@@ -30,43 +109,53 @@ def get_server_config() -> Dict[str, Any]:
         return {
             'queue_file': paths.get('queue_file', 'queue.txt'),
             'host': config.get('server.host', '0.0.0.0'),
-            'port': config.get('server.port', 8080, int)
+            'port': config.get('server.port', 8080, int),
+            'max_workers': config.get('server.max_workers', 8, int),
+            'reuse_port': config.get('server.reuse_port', False, bool)
         }
     except Exception:
         return {
             'queue_file': 'queue.txt',
             'host': '0.0.0.0',
-            'port': 8080
+            'port': 8080,
+            'max_workers': 8,
+            'reuse_port': False
         }
 
 
-class WebhookHandler(BaseHTTPRequestHandler):
-    """处理 Webhook 请求的处理器"""
-
-    config: Dict[str, Any] = {}
-
-    def log_message(self, format: str, *args) -> None:
-        """自定义日志格式"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {format % args}")
-
-    def _send_json(self, status_code: int, data: Dict[str, Any]) -> None:
-        """发送 JSON 响应"""
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
-
-    def _send_html(self, status_code: int, html: str) -> None:
-        """发送 HTML 响应"""
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'text/html; charset=utf-8')
-        self.end_headers()
-        self.wfile.write(html.encode('utf-8'))
-
-    def _get_index_page(self) -> str:
-        """返回简单的首页 HTML"""
-        return f"""<!DOCTYPE html>
+class BoundedThreadingHTTPServer(ThreadingHTTPServer):
+    """
+    每个连接一个线程，同时处理的请求数有上限的 HTTP 服务器
+
+    名额按请求占用（见 WebhookHandler.parse_request），空闲的持久连接不占名额，
+    不会挡住其他连接。
+    """
+
+    def __init__(
+        self,
+        server_address,
+        handler_class,
+        max_workers: int = 8,
+        reuse_port: bool = False,
+    ):
+        self.request_slots = threading.BoundedSemaphore(max_workers)
+        self._reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+
+    def server_bind(self) -> None:
+        # SO_REUSEPORT：允许多个服务器进程绑定同一端口，由内核分发连接
+        # （socketserver 的 allow_reuse_port 在 Python 3.11 之前不生效，这里自行设置）
+        if self._reuse_port:
+            if not hasattr(socket, "SO_REUSEPORT"):
+                raise OSError("SO_REUSEPORT is not supported on this platform")
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+@lru_cache(maxsize=4)
+def _render_default_index_page(port: int) -> bytes:
+    """渲染默认首页，端口在启动后不变，编码结果按端口缓存"""
+    html = f"""<!DOCTYPE html>
 <html>
 <head>
     <title>GhostRadio Trigger</title>
@@ -89,7 +178,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
 
     <h3>请求示例</h3>
     <div class="example">
-        <code>curl -X POST http://localhost:{self.config.get('port', 8080)}/webhook \\<br>
+        <code>curl -X POST http://localhost:{port}/webhook \\<br>
         -H "Content-Type: application/json" \\<br>
         -d '{{"url": "https://example.com/article"}}'</code>
     </div>
@@ -102,6 +191,122 @@ class WebhookHandler(BaseHTTPRequestHandler):
     <p><small>GhostRadio - 极致省资源的播客生成器</small></p>
 </body>
 </html>"""
+    return html.encode('utf-8')
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """处理 Webhook 请求的处理器"""
+
+    config: Dict[str, Any] = {}
+
+    # 启用 HTTP/1.1 持久连接，所有响应都需带 Content-Length
+    protocol_version = 'HTTP/1.1'
+
+    # socket 超时（秒）：空闲的持久连接超时后关闭，结束其处理线程
+    timeout = 5
+
+    # 响应都很小，关闭 Nagle 算法避免与延迟确认叠加产生约 40ms 的等待
+    disable_nagle_algorithm = True
+
+    # 带缓冲的 wfile：响应头和响应体在同一次 send 中发出，
+    # 每个请求结束时由 handle_one_request 刷新
+    wbufsize = 64 * 1024
+
+    # 队列文件的追加写描述符及其 (st_dev, st_ino)，在请求之间复用
+    _queue_fd: Optional[int] = None
+    _queue_fd_id: Optional[tuple] = None
+    _queue_fd_lock = threading.Lock()
+
+    # 固定内容的响应体，预先编码
+    _HEALTH_BODY = json_utils.dumps({"status": "ok", "service": "ghostradio-trigger"})
+    _NOT_FOUND_BODY = json_utils.dumps({"error": "Not found"})
+
+    # 队列时间戳缓存：(Unix 秒, ISO 格式字符串)
+    _ts_cache: Tuple[int, str] = (0, "")
+
+    # 前端页面缓存：(st_mtime_ns, st_size, 内容)，文件变化时重新读取
+    _index_cache: Optional[Tuple[int, int, bytes]] = None
+
+    # 当前请求占用的服务器处理名额
+    _slot: Optional[threading.BoundedSemaphore] = None
+
+    def parse_request(self) -> bool:
+        """请求行已读到，开始处理前占用服务器的处理名额"""
+        slots = getattr(self.server, 'request_slots', None)
+        if slots is not None:
+            slots.acquire()
+            self._slot = slots
+        return super().parse_request()
+
+    def handle_one_request(self) -> None:
+        """处理一个请求，响应发出后归还处理名额"""
+        try:
+            super().handle_one_request()
+        finally:
+            if self._slot is not None:
+                self._slot.release()
+                self._slot = None
+
+    def log_message(self, format: str, *args) -> None:
+        """自定义日志格式"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        print(f"[{timestamp}] {format % args}")
+
+    def end_headers(self) -> None:
+        """结束响应头；不复用的 HTTP/1.1 连接告知客户端关闭"""
+        if self.close_connection and self.request_version == 'HTTP/1.1':
+            self.send_header('Connection', 'close')
+        super().end_headers()
+
+    def _send_bytes(
+        self,
+        status_code: int,
+        body: bytes,
+        content_type: str = 'application/json',
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """发送已编码的响应体"""
+        self.send_response(status_code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if headers:
+            for name, value in headers.items():
+                self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag: str) -> bool:
+        """请求的 If-None-Match 与 etag 一致时发送 304 并返回 True"""
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        if if_none_match.strip() != '*' and etag not in (
+            tag.strip() for tag in if_none_match.split(',')
+        ):
+            return False
+
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return True
+
+    def _send_json(self, status_code: int, data: Dict[str, Any]) -> None:
+        """发送 JSON 响应"""
+        self._send_bytes(status_code, json_utils.dumps(data))
+
+    def _send_html(
+        self,
+        status_code: int,
+        html: Union[str, bytes],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """发送 HTML 响应，html 可以是已编码的 UTF-8 字节串"""
+        body = html if isinstance(html, bytes) else html.encode('utf-8')
+        self._send_bytes(status_code, body, 'text/html; charset=utf-8', headers)
+
+    def _get_index_page(self) -> bytes:
+        """返回默认首页 HTML（已编码）"""
+        return _render_default_index_page(self.config.get('port', 8080))
 
     def do_GET(self) -> None:
         """处理 GET 请求"""
@@ -118,15 +323,28 @@ class WebhookHandler(BaseHTTPRequestHandler):
         
         # 页面路由
         if self.path == "/health":
-            self._send_json(200, {"status": "ok", "service": "ghostradio-trigger"})
+            self._send_bytes(200, self._HEALTH_BODY)
         elif self.path == "/":
             # 返回新的前端页面
             self._serve_index_page()
         else:
-            self._send_json(404, {"error": "Not found"})
+            self._send_bytes(404, self._NOT_FOUND_BODY)
 
     def do_POST(self) -> None:
         """处理 POST 请求"""
+        # 部分路由不会读取请求体，剩余数据会被当成下一个请求，因此 POST 后不复用连接
+        self.close_connection = True
+
+        # 读取请求体之前检查长度，避免按客户端给出的 Content-Length 分配缓冲区
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self._send_json(400, {"error": "Invalid Content-Length"})
+            return
+        if content_length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "Payload too large"})
+            return
+
         # API 路由
         if self.path.startswith('/api/'):
             status_code, data, content_type = handle_api_request(self, self.path, 'POST')
@@ -137,22 +355,23 @@ class WebhookHandler(BaseHTTPRequestHandler):
         if self.path == "/webhook":
             self._handle_webhook()
         else:
-            self._send_json(404, {"error": "Not found"})
+            self._send_bytes(404, self._NOT_FOUND_BODY)
 
     def _handle_webhook(self) -> Optional[Dict[str, Any]]:
         """处理 Webhook - 接收 URL 并写入队列"""
         try:
             content_length: int = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
+            if content_length <= 0:
                 self._send_json(400, {"error": "Empty request body"})
                 return None
 
-            post_data: str = self.rfile.read(content_length).decode('utf-8')
+            # 直接解析原始字节，不是 JSON 时把请求体当作纯文本 URL
+            post_data: bytes = self.rfile.read(content_length)
 
             try:
-                data: Dict[str, Any] = json.loads(post_data)
-            except json.JSONDecodeError:
-                data = {"url": post_data.strip()}
+                data: Dict[str, Any] = json_utils.loads(post_data)
+            except json_utils.JSONDecodeError:
+                data = {"url": post_data.decode('utf-8', 'ignore').strip()}
 
             url: str = data.get('url', '').strip()
 
@@ -160,16 +379,15 @@ class WebhookHandler(BaseHTTPRequestHandler):
                 self._send_json(400, {"error": "Missing 'url' parameter"})
                 return None
 
-            if not url.startswith(('http://', 'https://')):
+            if not _URL_RE.match(url):
                 self._send_json(400, {"error": "Invalid URL format"})
                 return None
 
-            timestamp: str = datetime.now().isoformat()
-            queue_entry: str = f"{timestamp}|{url}\n"
+            timestamp: str = self._queue_timestamp()
+            queue_entry: bytes = f"{timestamp}|{url}\n".encode('utf-8')
 
             queue_file: str = self.config.get('queue_file', 'queue.txt')
-            with open(queue_file, 'a', encoding='utf-8') as f:
-                f.write(queue_entry)
+            self._append_to_queue(queue_file, queue_entry)
 
             self.log_message("Added to queue: %s", url[:60])
             self._send_json(200, {
@@ -179,7 +397,7 @@ class WebhookHandler(BaseHTTPRequestHandler):
             })
             return {"success": True, "url": url}
 
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             self.log_message("JSON decode error: %s", str(e))
             self._send_json(400, {"error": f"Invalid JSON: {str(e)}"})
             return None
@@ -192,58 +410,145 @@ class WebhookHandler(BaseHTTPRequestHandler):
             self._send_json(500, {"error": str(e)})
             return None
 
+    @classmethod
+    def _queue_timestamp(cls) -> str:
+        """队列记录的时间戳（本地时间，精确到秒），同一秒内复用已格式化的字符串"""
+        now = int(time.time())
+        cached = cls._ts_cache
+        if cached[0] != now:
+            cached = (now, datetime.fromtimestamp(now).isoformat())
+            cls._ts_cache = cached
+        return cached[1]
+
+    @classmethod
+    def _append_to_queue(cls, queue_file: str, entry: bytes) -> None:
+        """
+        追加一条队列记录
+
+        O_APPEND 描述符在请求之间复用，省去每次的 open/close。
+        Worker 迁移旧队列时会把队列文件改名，路径不再指向已打开的文件时重新打开。
+        """
+        with cls._queue_fd_lock:
+            try:
+                st = os.stat(queue_file)
+                current_id = (st.st_dev, st.st_ino)
+            except FileNotFoundError:
+                current_id = None
+
+            if cls._queue_fd is not None and current_id != cls._queue_fd_id:
+                os.close(cls._queue_fd)
+                cls._queue_fd = None
+
+            if cls._queue_fd is None:
+                fd = os.open(queue_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                st = os.fstat(fd)
+                cls._queue_fd = fd
+                cls._queue_fd_id = (st.st_dev, st.st_ino)
+
+            os.write(cls._queue_fd, entry)
+
     def _send_response(self, status_code: int, data: Any, content_type: str) -> None:
         """发送通用响应"""
-        self.send_response(status_code)
-        self.send_header('Content-Type', content_type)
-        self.end_headers()
-        
         if content_type == 'application/json':
-            self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            body = json_utils.dumps(data)
         else:
-            self.wfile.write(str(data).encode('utf-8'))
+            body = str(data).encode('utf-8')
+        self._send_bytes(status_code, body, content_type)
 
     def _serve_static_file(self, file_path: str) -> None:
-        """提供静态文件服务"""
+        """提供静态文件服务，支持 Range 请求，文件内容由内核直接发送到 socket"""
+        # 是否可能已写出本文件的响应（响应头或部分内容）
+        response_started = False
         try:
-            path = Path(file_path)
-            if not path.exists():
+            # 解析后必须仍在静态文件目录内，拒绝 ../ 等跳出目录的路径
+            path = Path(file_path).resolve()
+            root = STATIC_ROOT.resolve()
+            if path != root and root not in path.parents:
+                self._send_json(403, {"error": "Forbidden"})
+                return
+            content_type = CONTENT_TYPES.get(path.suffix, 'application/octet-stream')
+
+            # 直接打开文件，不存在时返回 404（省去单独的存在性检查）
+            try:
+                f = open(path, 'rb')
+            except (FileNotFoundError, IsADirectoryError):
                 self._send_json(404, {"error": "File not found"})
                 return
-            
-            # 根据文件扩展名设置 Content-Type
-            content_type = 'application/octet-stream'
-            if path.suffix == '.mp3':
-                content_type = 'audio/mpeg'
-            elif path.suffix == '.html':
-                content_type = 'text/html'
-            elif path.suffix == '.css':
-                content_type = 'text/css'
-            elif path.suffix == '.js':
-                content_type = 'application/javascript'
-            
-            self.send_response(200)
-            self.send_header('Content-Type', content_type)
-            self.send_header('Content-Length', str(path.stat().st_size))
-            self.end_headers()
-            
-            with open(path, 'rb') as f:
-                self.wfile.write(f.read())
+
+            with f:
+                st = os.fstat(f.fileno())
+                etag = make_etag(st)
+
+                response_started = True
+                if self._not_modified(etag):
+                    return
+
+                size = st.st_size
+                start, end = 0, size - 1
+
+                range_header = self.headers.get('Range')
+                try:
+                    byte_range = parse_byte_range(range_header, size) if range_header else None
+                except ValueError:
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{size}')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                if byte_range:
+                    start, end = byte_range
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+                else:
+                    self.send_response(200)
+
+                length = end - start + 1
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(length))
+                self.send_header('Accept-Ranges', 'bytes')
+                self.send_header('ETag', etag)
+                self.send_header(
+                    'Cache-Control', CACHE_CONTROL.get(path.suffix, DEFAULT_CACHE_CONTROL)
+                )
+                self.end_headers()
+
+                # 先发出缓冲中的响应头，再由 socket.sendfile 发送文件内容
+                # （支持的平台上使用 os.sendfile 零拷贝，否则回退到 send）
+                self.wfile.flush()
+                if length > 0:
+                    self.connection.sendfile(f, start, length)
                 
         except Exception as e:
-            self._send_json(500, {"error": str(e)})
+            if not response_started:
+                self._send_json(500, {"error": str(e)})
+                return
+            # 响应已发出一部分，无法再改发 500，只能关闭连接让客户端发现响应不完整
+            self.close_connection = True
+            self.log_message("Failed to send %s: %s", file_path, str(e))
 
     def _serve_index_page(self) -> None:
         """提供前端页面"""
         try:
-            index_path = Path("episodes/index.html")
-            if index_path.exists():
-                with open(index_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self._send_html(200, content)
-            else:
+            try:
+                st = INDEX_PAGE_PATH.stat()
+            except FileNotFoundError:
                 # 返回默认的简单页面
                 self._send_html(200, self._get_index_page())
+                return
+
+            etag = make_etag(st)
+            if self._not_modified(etag):
+                return
+
+            # 每次请求只 stat 一次，文件未变化时直接发送缓存的内容
+            cache = WebhookHandler._index_cache
+            if cache is None or cache[:2] != (st.st_mtime_ns, st.st_size):
+                cache = (st.st_mtime_ns, st.st_size, INDEX_PAGE_PATH.read_bytes())
+                WebhookHandler._index_cache = cache
+            self._send_html(
+                200, cache[2], {'ETag': etag, 'Cache-Control': DEFAULT_CACHE_CONTROL}
+            )
         except Exception as e:
             self._send_json(500, {"error": str(e)})
 
@@ -254,12 +559,17 @@ def run_server() -> None:
     host: str = config['host']
     port: int = config['port']
     queue_file: str = config['queue_file']
+    max_workers: int = config['max_workers']
 
     WebhookHandler.config = config
 
-    server = HTTPServer((host, port), WebhookHandler)
+    # 慢速的音频下载不再阻塞 Webhook，同时处理的请求数受 max_workers 限制
+    server = BoundedThreadingHTTPServer(
+        (host, port), WebhookHandler, max_workers, reuse_port=config['reuse_port']
+    )
     print(f"GhostRadio Trigger Server started at http://{host}:{port}")
     print(f"Queue file: {queue_file}")
+    print(f"Max concurrent requests: {max_workers}")
     print("Press Ctrl+C to stop")
 
     try:
@@ -0,0 +1,255 @@
+"""
+TTS 结果缓存
+按合成参数和文本内容寻址，相同文本不再重复调用 TTS API
+
+缓存在 TTSGenerator.generate 这一层，键覆盖整段输入文本（worker 中即整期节目脚本），
+只有完全相同的文本（如任务重试）才会命中
+
+两级缓存：
+- 内存：按总字节数限制的 LRU，只保存较小的音频
+- 磁盘：{cache_dir}/{key[:2]}/{key}，超出容量时按最近使用时间淘汰
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import unicodedata
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger("tts_cache")
+
+# 不影响合成结果的参数（认证信息等），不参与缓存键计算
+_NON_AUDIO_PARAMS = frozenset({"appid", "token", "api_key", "is_encoded"})
+
+# 单个音频超过该大小时只存磁盘
+MAX_MEMORY_ITEM_BYTES = 1024 * 1024
+
+
+def normalize_text(text: str) -> str:
+    """规范化文本：去掉首尾空白并统一为 NFC，使等价文本得到相同的缓存键"""
+    return unicodedata.normalize("NFC", text.strip())
+
+
+def make_cache_key(provider: Any, text: str, params: Dict[str, Any]) -> str:
+    """
+    计算缓存键
+
+    Args:
+        provider: TTS Provider 实例（读取名称、音色、语速等配置）
+        text: 要合成的文本
+        params: 传给 synthesize 的额外参数
+
+    Returns:
+        SHA-256 十六进制字符串
+    """
+    config = getattr(provider, "config", {}) or {}
+    material = {
+        "provider": provider.get_provider_name(),
+        "voice": getattr(provider, "voice", None),
+        "speed": getattr(provider, "speed", None),
+        "volume": getattr(provider, "volume", None),
+        "pitch": getattr(provider, "pitch", None),
+        "model": config.get("model"),
+        "encoding": config.get("encoding"),
+        "params": {
+            k: v for k, v in params.items() if k not in _NON_AUDIO_PARAMS
+        },
+        "text": normalize_text(text),
+    }
+    payload = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    TTS 音频缓存（线程安全）
+
+    使用方式：
+        with cache.lock(key):
+            if not cache.fetch_to_file(key, output_path):
+                ... 合成到 output_path ...
+                cache.store_file(key, output_path)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        memory_bytes: int = 8 * 1024 * 1024,
+        max_disk_bytes: int = 100 * 1024 * 1024,
+    ) -> None:
+        """
+        Args:
+            cache_dir: 磁盘缓存目录
+            memory_bytes: 内存缓存总字节数上限，0 表示不使用内存缓存
+            max_disk_bytes: 磁盘缓存总字节数上限
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.memory_bytes = memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        # 磁盘占用在第一次写入时统计，之后增量维护
+        self._disk_used: Optional[int] = None
+        self._mutex = threading.Lock()
+        # 每个缓存键一把锁，相同文本的并发请求只合成一次
+        self._key_locks: "weakref.WeakValueDictionary[str, Any]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["TTSCache"]:
+        """根据配置创建缓存，未启用时返回 None"""
+        if not config.get("enabled"):
+            return None
+        return cls(
+            config.get("cache_dir", "~/.cache/ghostradio/tts"),
+            memory_bytes=int(config.get("memory_mb", 8) * 1024 * 1024),
+            max_disk_bytes=int(config.get("max_disk_mb", 100) * 1024 * 1024),
+        )
+
+    def lock(self, key: str) -> Any:
+        """获取缓存键对应的锁"""
+        with self._mutex:
+            key_lock = self._key_locks.get(key)
+            if key_lock is None:
+                key_lock = threading.Lock()
+                self._key_locks[key] = key_lock
+            return key_lock
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def fetch_to_file(self, key: str, output_path: str) -> bool:
+        """
+        命中时把缓存的音频写到 output_path
+
+        Returns:
+            是否命中
+        """
+        with self._mutex:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+
+        if data is not None:
+            with open(output_path, "wb") as f:
+                f.write(data)
+            return True
+
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+        except FileNotFoundError:
+            return False
+
+        self._touch(path)
+        return True
+
+    def store_file(self, key: str, file_path: str) -> None:
+        """把已生成的音频文件写入缓存"""
+        try:
+            size = os.path.getsize(file_path)
+            with open(file_path, "rb") as src:
+                self._write_disk(key, lambda f: shutil.copyfileobj(src, f))
+                if size <= MAX_MEMORY_ITEM_BYTES and self.memory_bytes:
+                    src.seek(0)
+                    self._remember(key, src.read())
+        except OSError as e:
+            # 缓存失败不影响合成结果
+            logger.warning(f"Failed to cache TTS output {file_path}: {e}")
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """放入内存 LRU"""
+        size = len(data)
+        if size > MAX_MEMORY_ITEM_BYTES or size > self.memory_bytes:
+            return
+
+        with self._mutex:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_used -= len(old)
+            self._memory[key] = data
+            self._memory_used += size
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _write_disk(self, key: str, write) -> None:
+        """原子写入磁盘缓存文件"""
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            size = os.path.getsize(tmp_path)
+            # 覆盖已有条目时，被替换文件的大小不再计入占用
+            try:
+                size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._mutex:
+            if self._disk_used is None:
+                self._disk_used = self._scan_disk_usage()
+            else:
+                self._disk_used += size
+            over_limit = self._disk_used > self.max_disk_bytes
+
+        if over_limit:
+            self._evict_disk()
+
+    def _iter_disk_entries(self):
+        """遍历磁盘缓存文件，产出 (路径, stat)"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if entry.is_file() and not entry.name.startswith(".tmp-"):
+                    yield entry.path, entry.stat()
+
+    def _scan_disk_usage(self) -> int:
+        return sum(st.st_size for _, st in self._iter_disk_entries())
+
+    def _evict_disk(self) -> None:
+        """按最近使用时间淘汰磁盘缓存，直到低于上限的 90%"""
+        entries = sorted(self._iter_disk_entries(), key=lambda e: e[1].st_mtime)
+        used = sum(st.st_size for _, st in entries)
+        target = self.max_disk_bytes * 0.9
+
+        for path, st in entries:
+            if used <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            used -= st.st_size
+
+        with self._mutex:
+            self._disk_used = used
+
+    @staticmethod
+    def _touch(path: str) -> None:
+        """更新修改时间，作为淘汰时的最近使用时间"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
@@ -9,15 +9,30 @@ TTS 音频生成模块
 """
 
 import os
+import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, TypedDict
 
 from .tts_providers import create_tts_provider, TTSProviderFactory
+from .tts_providers.base_tts_provider import (
+    ERROR_CLIENT,
+    ERROR_IO,
+    ERROR_RATE_LIMIT,
+    ERROR_SERVER,
+    classify_error,
+)
 from .model_health_checker import get_health_checker
+from .tts_cache import TTSCache, make_cache_key
 from .logger import get_logger
 
 logger = get_logger("tts_generator")
 
+# 可用音色列表的缓存时长（秒），部分 Provider 获取音色列表需要网络请求
+VOICE_LIST_TTL = 300.0
+
+# 被限流时的最长退避时间（秒）
+MAX_RATE_LIMIT_BACKOFF = 10
+
 
 class TTSResult(TypedDict):  # type: ignore[misc]
     """TTS 生成结果类型"""
@@ -52,12 +67,22 @@ class TTSGenerator:
     - Provider 故障时自动切换（前端无感知）
     """
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        cache: Optional[TTSCache] = None,
+    ) -> None:
         """
         初始化 TTS 生成器
 
         优先使用传入配置，否则从健康检查器获取当前可用 Provider 配置
+
+        Args:
+            config: TTS 配置
+            cache: TTS 结果缓存，为 None 时每次都调用 Provider
         """
+        self._cache = cache
+
         if config and config.get("api_key"):
             self._config = config
             logger.info(f"Using provided TTS config: {self._config.get('provider')}")
@@ -76,6 +101,10 @@ class TTSGenerator:
 
         # 延迟初始化 Provider
         self._provider = None
+        self._provider_name = ""
+        self._voice = ""
+        # (获取时间, 音色列表)，切换 Provider 时清空
+        self._voice_list_cache: Optional[tuple] = None
 
     def _init_provider(self) -> None:
         """初始化 TTS Provider"""
@@ -91,25 +120,78 @@ class TTSGenerator:
                 f"Failed to initialize TTS provider '{provider_name}': {e}"
             ) from e
 
+        # 缓存 Provider 元信息，仅在切换 Provider 时重新获取
+        self._provider_name = self._provider.get_provider_name()
+        self._voice = self._config.get("voice", "")
+        self._voice_list_cache = None
+
     def generate(self, text: str, output_path: str, **kwargs) -> TTSResult:
         """
         生成音频文件
 
         支持通过 kwargs 传递 Provider 特定参数
-        如果当前 Provider 失败，自动切换到下一个可用 Provider 重试
+        按失败类别处理：请求错误直接返回，限流时退避后重试，
+        服务端/网络错误自动切换到下一个可用 Provider 重试
+        配置了缓存时，相同参数和文本直接复用之前的合成结果
         """
         # 确保 Provider 已初始化
         self._init_provider()
 
+        if self._cache is None:
+            return self._generate(text, output_path, **kwargs)
+
+        # 相同文本的并发请求只合成一次，其余等待后直接命中缓存
+        with self._cache.lock(make_cache_key(self._provider, text, kwargs)):
+            self._ensure_output_dir(output_path)
+            cached = self._fetch_cached(text, output_path, kwargs)
+            if cached is not None:
+                return cached
+
+            result = self._generate(text, output_path, **kwargs)
+            self._store_cached(text, result, kwargs)
+            return result
+
+    def _fetch_cached(
+        self, text: str, output_path: str, params: Dict[str, Any]
+    ) -> Optional[TTSResult]:
+        """缓存命中时把音频写到 output_path 并返回结果"""
+        if self._cache is None:
+            return None
+
+        key = make_cache_key(self._provider, text, params)
+        if not self._cache.fetch_to_file(key, output_path):
+            return None
+
+        logger.info(
+            f"TTS cache hit",
+            context={"provider": self._provider_name, "output_path": output_path},
+        )
+        return TTSResult(
+            success=True,
+            file_path=output_path,
+            duration=self._provider.estimate_duration(text),
+            error="",
+        )
+
+    def _store_cached(
+        self, text: str, result: TTSResult, params: Dict[str, Any]
+    ) -> None:
+        """把成功的合成结果写入缓存（按实际使用的 Provider 计算缓存键）"""
+        if self._cache is not None and result["success"] and result["file_path"]:
+            key = make_cache_key(self._provider, text, params)
+            self._cache.store_file(key, result["file_path"])
+
+    def _generate(self, text: str, output_path: str, **kwargs) -> TTSResult:
+        """调用 Provider 生成音频文件，失败时按错误类别重试或切换 Provider"""
         max_retries = 3
         last_error = None
-        current_provider = self.provider_info["name"]
+        current_provider = self._provider_name
 
         logger.info(
             f"Starting TTS generation",
             context={
                 "provider": current_provider,
-                "voice": kwargs.get("voice") or self.provider_info.get("voice"),
+                "voice": kwargs.get("voice") or self._voice,
                 "text_length": len(text),
                 "output_path": output_path,
                 "extra_params": list(kwargs.keys()),
@@ -119,9 +201,7 @@ class TTSGenerator:
         for attempt in range(max_retries):
             try:
                 # 确保输出目录存在
-                output_dir = os.path.dirname(output_path)
-                if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
+                self._ensure_output_dir(output_path)
 
                 # 使用 Provider 合成语音
                 result = self._provider.synthesize(text, output_path, **kwargs)
@@ -154,19 +234,37 @@ class TTSGenerator:
                 else:
                     # API 返回错误，可能是 Provider 问题
                     error_msg = result.get("error", "Unknown error")
+                    error_class = result.get("error_class", ERROR_SERVER)
                     logger.warning(
                         f"TTS API error",
                         context={
                             "provider": current_provider,
                             "attempt": attempt + 1,
                             "error": error_msg,
+                            "error_class": error_class,
                             "raw_response": result,
                         },
                     )
 
+                    # 请求本身有误，重试或换 Provider 都不会成功
+                    if error_class == ERROR_CLIENT:
+                        return TTSResult(
+                            success=False, file_path="", duration=0.0, error=error_msg
+                        )
+
+                    if error_class == ERROR_RATE_LIMIT:
+                        last_error = error_msg
+                        self._backoff(attempt)
+                        continue  # 用同一 Provider 重试
+
+                    # 本地文件读写失败与 Provider 无关，不切换 Provider（下次尝试前重新创建输出目录）
+                    if error_class == ERROR_IO:
+                        last_error = error_msg
+                        continue
+
                     # 尝试切换 Provider
                     if self._try_switch_provider():
-                        current_provider = self.provider_info["name"]
+                        current_provider = self._provider_name
                         logger.info(f"Switched to new TTS provider: {current_provider}")
                         continue  # 用新 Provider 重试
                     else:
@@ -177,19 +275,33 @@ class TTSGenerator:
 
             except Exception as e:
                 last_error = e
+                error_class = classify_error(e)
                 logger.error(
                     f"TTS generation exception",
                     context={
                         "provider": current_provider,
                         "attempt": attempt + 1,
                         "error": str(e),
+                        "error_class": error_class,
                     },
                     error=e,
                 )
 
+                if error_class == ERROR_CLIENT:
+                    return TTSResult(
+                        success=False, file_path="", duration=0.0, error=str(e)
+                    )
+
+                if error_class == ERROR_RATE_LIMIT:
+                    self._backoff(attempt)
+                    continue  # 用同一 Provider 重试
+
+                if error_class == ERROR_IO:
+                    continue  # 本地文件错误，用同一 Provider 重试
+
                 # 尝试切换 Provider
                 if self._try_switch_provider():
-                    current_provider = self.provider_info["name"]
+                    current_provider = self._provider_name
                     logger.info(
                         f"Switched to new TTS provider after exception: {current_provider}"
                     )
@@ -214,6 +326,18 @@ class TTSGenerator:
             error=f"Failed after {max_retries} attempts: {str(last_error)}",
         )
 
+    @staticmethod
+    def _ensure_output_dir(output_path: str) -> None:
+        """创建输出文件所在目录（每次都检查，目录可能已被外部删除）"""
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    @staticmethod
+    def _backoff(attempt: int) -> None:
+        """被限流时按指数退避等待"""
+        time.sleep(min(2**attempt, MAX_RATE_LIMIT_BACKOFF))
+
     def _try_switch_provider(self) -> bool:
         """
         尝试切换到下一个可用 Provider
@@ -227,9 +351,10 @@ class TTSGenerator:
 
             # 更新配置并重新初始化 provider
             self._config = new_config
+            self._provider = None
             self._init_provider()
 
-            logger.info(f"Switched to TTS provider: {new_config.get('provider')}")
+            logger.info(f"Switched to TTS provider: {self._provider_name}")
             return True
 
         except RuntimeError as e:
@@ -239,12 +364,24 @@ class TTSGenerator:
     @property
     def provider_info(self) -> Dict[str, Any]:
         """获取当前 Provider 信息"""
+        self._init_provider()
         return {
-            "name": self._provider.get_provider_name(),
-            "voice": self._config.get("voice", ""),
-            "available_voices": self._provider.get_voice_list(),
+            "name": self._provider_name,
+            "voice": self._voice,
+            "available_voices": self._get_voice_list(),
         }
 
+    def _get_voice_list(self) -> List[Any]:
+        """获取当前 Provider 的音色列表，在 VOICE_LIST_TTL 内复用上次结果"""
+        now = time.monotonic()
+        cached = self._voice_list_cache
+        if cached is not None and now - cached[0] < VOICE_LIST_TTL:
+            return cached[1]
+
+        voices = self._provider.get_voice_list()
+        self._voice_list_cache = (now, voices)
+        return voices
+
     @property
     def config(self) -> Dict[str, Any]:
         """获取配置副本（只读）"""
@@ -3,8 +3,193 @@ TTS Provider 抽象基类
 定义所有 TTS Provider 的通用接口
 """
 
+import os
+import re
+import sys
+import json
+import shutil
+import socket
+import asyncio
+import tempfile
+import subprocess
+import functools
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Coroutine, List, Optional, Tuple
+
+
+# 合成失败时结果中 error_class 字段的取值
+ERROR_CLIENT = 'client'          # 请求本身有误（音色无效、文本为空等），重试无意义
+ERROR_SERVER = 'server'          # 服务端错误，可切换 Provider 重试
+ERROR_NETWORK = 'network'        # 网络/超时错误，可切换 Provider 重试
+ERROR_RATE_LIMIT = 'rate_limit'  # 被限流，退避后重试
+ERROR_IO = 'io'                  # 本地文件读写错误（目录不存在、磁盘已满等），与 Provider 无关
+
+# 各 Provider 所用网络库中表示连接/传输失败的异常 (模块名, 类名)；
+# 只检查已导入的模块，不为了分类而导入这些库
+_TRANSPORT_ERRORS = (
+    ('httpx', 'TransportError'),
+    ('openai', 'APIConnectionError'),
+    ('aiohttp', 'ClientConnectionError'),
+    ('websockets.exceptions', 'WebSocketException'),
+    ('requests.exceptions', 'RequestException'),
+)
+
+
+def _is_transport_error(exc: BaseException) -> bool:
+    """是否为网络连接/超时错误"""
+    # Python 3.10 之前 socket.timeout 不是 TimeoutError 的子类
+    if isinstance(exc, (
+        ConnectionError, TimeoutError, asyncio.TimeoutError, socket.timeout, socket.gaierror
+    )):
+        return True
+    for module_name, class_name in _TRANSPORT_ERRORS:
+        error_type = getattr(sys.modules.get(module_name), class_name, None)
+        if isinstance(error_type, type) and isinstance(exc, error_type):
+            return True
+    return False
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    根据异常判断失败类别
+    
+    Args:
+        exc: 合成过程中抛出的异常
+        
+    Returns:
+        str: ERROR_CLIENT / ERROR_SERVER / ERROR_NETWORK / ERROR_RATE_LIMIT / ERROR_IO 之一
+    """
+    # HTTP 错误携带状态码（requests / OpenAI SDK / websockets）
+    status_code = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if status_code is None:
+        status_code = getattr(exc, 'status_code', None)
+    
+    if isinstance(status_code, int):
+        if status_code == 429:
+            return ERROR_RATE_LIMIT
+        if 400 <= status_code < 500:
+            return ERROR_CLIENT
+        return ERROR_SERVER
+    
+    if _is_transport_error(exc):
+        return ERROR_NETWORK
+    # 其余 OSError 来自本地文件操作；ffmpeg 合并失败同样属于本地处理错误
+    if isinstance(exc, (OSError, subprocess.CalledProcessError)):
+        return ERROR_IO
+    # 服务端返回的内容无法解析
+    if isinstance(exc, (json.JSONDecodeError, UnicodeError)):
+        return ERROR_SERVER
+    if isinstance(exc, ValueError):
+        return ERROR_CLIENT
+    return ERROR_SERVER
+
+
+# 一个句子：非结束符文本 + 句末标点，连同其后的换行；开头多余的标点/换行单独匹配
+_SENTENCE_RE = re.compile(r'(?:[^。！？.!?\n]+[。！？.!?]*|[。！？.!?]+)\n*|\n+')
+
+
+def _split_sentences(text: str, max_length: int) -> List[str]:
+    """按句子把文本分成不超过 max_length 的段，只含空白的段被丢弃"""
+    chunks: List[str] = []
+    parts: List[str] = []
+    length = 0
+    
+    def _flush(chunk: str) -> None:
+        if chunk.strip():
+            chunks.append(chunk)
+    
+    for match in _SENTENCE_RE.finditer(text):
+        sentence = match.group()
+        if length + len(sentence) <= max_length:
+            parts.append(sentence)
+            length += len(sentence)
+            continue
+        
+        if parts:
+            _flush(''.join(parts))
+        # 单句超长时按长度硬切
+        while len(sentence) > max_length:
+            _flush(sentence[:max_length])
+            sentence = sentence[max_length:]
+        parts = [sentence]
+        length = len(sentence)
+    
+    if parts:
+        _flush(''.join(parts))
+    
+    return chunks if chunks else [text[:max_length]]
+
+
+def run_coroutine(coro: Coroutine) -> Any:
+    """
+    在同步代码中运行协程
+    
+    当前线程没有运行中的事件循环时直接 asyncio.run；
+    已在事件循环中（asyncio.run 会报错）时交给新线程执行并等待结果
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class ChunkedFileSink:
+    """
+    音频输出文件
+    
+    Provider 收到音频块后直接写入，按文件系统块大小的整数倍缓冲落盘，
+    无需在内存中拼接完整音频
+    """
+    
+    # 缓冲区为多少个文件系统块
+    BLOCKS_PER_BUFFER = 32
+    
+    def __init__(self, path: str, bufsize: Optional[int] = None):
+        """
+        Args:
+            path: 输出文件路径（所在目录需已存在）
+            bufsize: 缓冲区大小，默认按目录所在文件系统的块大小计算
+        """
+        if bufsize is None:
+            directory = os.path.dirname(path) or '.'
+            bufsize = os.stat(directory).st_blksize * self.BLOCKS_PER_BUFFER
+        
+        self.path = path
+        self.bytes_written = 0
+        self._file = open(path, 'wb', buffering=bufsize)
+    
+    def write(self, data: bytes) -> int:
+        """写入一个音频块"""
+        written = self._file.write(data)
+        self.bytes_written += written
+        return written
+    
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+    
+    def close(self) -> None:
+        """刷新缓冲并关闭文件"""
+        self._file.close()
+    
+    def discard(self) -> None:
+        """关闭并删除未写完的文件"""
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def __enter__(self) -> 'ChunkedFileSink':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
 
 
 class TTSProvider(ABC):
@@ -14,6 +199,12 @@ class TTSProvider(ABC):
     所有具体的 TTS Provider 实现都需要继承此类
     """
     
+    # synthesize_async 是否为原生协程实现；否则使用默认实现，在线程池中调用 synthesize
+    supports_async = False
+    
+    # 长文本分段并发合成的默认并发数，可通过配置 concurrency 覆盖（各 Provider 共用）
+    DEFAULT_CONCURRENCY = 4
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化 TTS Provider
@@ -27,6 +218,7 @@ class TTSProvider(ABC):
         self.speed = config.get('speed', 1.0)
         self.volume = config.get('volume', 1.0)
         self.pitch = config.get('pitch', 1.0)
+        self.concurrency = max(1, int(config.get('concurrency', self.DEFAULT_CONCURRENCY)))
         
         # 验证配置
         self.validate_config()
@@ -47,10 +239,74 @@ class TTSProvider(ABC):
             **kwargs: 额外的参数
             
         Returns:
-            Dict: 包含 success, file_path, duration, error 等字段
+            Dict: 包含 success, file_path, duration, error 等字段，
+                失败时可附带 error_class（见 classify_error）
         """
         pass
     
+    async def synthesize_async(
+        self,
+        text: str,
+        output_path: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        异步合成语音，参数与返回值同 synthesize
+        
+        默认在事件循环的线程池中调用 synthesize；原生异步实现的 Provider
+        覆盖此方法并将 supports_async 设为 True
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.synthesize, text, output_path, **kwargs)
+        )
+    
+    def synthesize_batch(
+        self,
+        items: List[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        批量合成语音
+        
+        所有段落共用一个事件循环，通过 synthesize_async 并发执行
+        
+        Args:
+            items: (text, output_path) 列表
+            max_concurrency: 最大并发数，默认为 self.concurrency
+            
+        Returns:
+            list: 与 items 顺序一致的结果
+        """
+        return run_coroutine(self.synthesize_many(items, max_concurrency, **kwargs))
+    
+    async def synthesize_many(
+        self,
+        items: List[Tuple[str, str]],
+        max_concurrency: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """并发调用 synthesize_async，抛出的异常转换为失败结果"""
+        if max_concurrency is None:
+            max_concurrency = self.concurrency
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def _synthesize_one(text: str, output_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.synthesize_async(text, output_path, **kwargs)
+                except Exception as e:
+                    return {
+                        'success': False,
+                        'error': str(e),
+                        'error_class': classify_error(e)
+                    }
+        
+        return await asyncio.gather(
+            *(_synthesize_one(text, path) for text, path in items)
+        )
+    
     @abstractmethod
     def validate_config(self) -> bool:
         """
@@ -84,29 +340,56 @@ class TTSProvider(ABC):
         if len(text) <= max_length:
             return [text]
         
-        # 按句子分割
-        import re
-        sentences = re.split(r'([。！？.!?]+)', text)
+        return _split_sentences(text, max_length)
+    
+    def _merge_audio_files(
+        self,
+        file_paths: List[str],
+        output_path: str,
+        audio_format: str = 'mp3'
+    ) -> None:
+        """
+        按顺序拼接多个音频文件
         
-        chunks = []
-        current_chunk = ""
+        各段由同一 Provider 以相同编码参数生成，优先用 ffmpeg concat 直接复制音频流
+        （不解码、不重新编码）；没有 ffmpeg 时回退到 pydub 解码后重新导出
         
-        for i in range(0, len(sentences), 2):
-            sentence = sentences[i]
-            if i + 1 < len(sentences):
-                sentence += sentences[i + 1]
-            
-            if len(current_chunk) + len(sentence) < max_length:
-                current_chunk += sentence
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = sentence
+        Args:
+            file_paths: 分段音频文件路径
+            output_path: 输出文件路径
+            audio_format: 音频格式（仅 pydub 回退时使用）
+        """
+        if shutil.which('ffmpeg'):
+            list_file = tempfile.NamedTemporaryFile(
+                'w', suffix='.txt', delete=False, encoding='utf-8'
+            )
+            try:
+                with list_file:
+                    for file_path in file_paths:
+                        # concat 列表中单引号需写成 '\''
+                        escaped = os.path.abspath(file_path).replace("'", "'\\''")
+                        list_file.write(f"file '{escaped}'\n")
+                
+                subprocess.run([
+                    'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+                    '-f', 'concat', '-safe', '0',
+                    '-i', list_file.name,
+                    '-c', 'copy',
+                    output_path
+                ], check=True, capture_output=True)
+            finally:
+                os.remove(list_file.name)
+            return
         
-        if current_chunk:
-            chunks.append(current_chunk)
+        try:
+            from pydub import AudioSegment
+        except ImportError:
+            raise RuntimeError("Merging audio requires ffmpeg or pydub")
         
-        return chunks if chunks else [text[:max_length]]
+        combined = AudioSegment.empty()
+        for file_path in file_paths:
+            combined += AudioSegment.from_file(file_path, format=audio_format)
+        combined.export(output_path, format=audio_format)
     
     def estimate_duration(self, text: str) -> float:
         """
@@ -4,9 +4,8 @@ Edge TTS Provider 实现
 """
 
 import os
-import asyncio
 from typing import Dict, Any
-from .base_tts_provider import TTSProvider
+from .base_tts_provider import TTSProvider, classify_error, run_coroutine
 
 
 class EdgeTTSProvider(TTSProvider):
@@ -28,6 +27,8 @@ class EdgeTTSProvider(TTSProvider):
         'zh-CN-shaanxi-XiaoniNeural',    # 陕西小妮
     ]
     
+    supports_async = True
+    
     def __init__(self, config: Dict[str, Any]):
         config.setdefault('voice', 'zh-CN-XiaoxiaoNeural')
         config.setdefault('speed', 1.0)
@@ -38,6 +39,10 @@ class EdgeTTSProvider(TTSProvider):
         return True
     
     def synthesize(self, text: str, output_path: str, **kwargs) -> Dict[str, Any]:
+        # 运行异步函数
+        return run_coroutine(self.synthesize_async(text, output_path, **kwargs))
+    
+    async def synthesize_async(self, text: str, output_path: str, **kwargs) -> Dict[str, Any]:
         try:
             import edge_tts
             
@@ -53,12 +58,8 @@ class EdgeTTSProvider(TTSProvider):
             else:
                 rate = "+0%"
             
-            async def _synthesize():
-                communicate = edge_tts.Communicate(text, voice, rate=rate)
-                await communicate.save(output_path)
-            
-            # 运行异步函数
-            asyncio.run(_synthesize())
+            communicate = edge_tts.Communicate(text, voice, rate=rate)
+            await communicate.save(output_path)
             
             # 估算时长
             duration = self.estimate_duration(text) / speed
@@ -78,7 +79,8 @@ class EdgeTTSProvider(TTSProvider):
         except Exception as e:
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'error_class': classify_error(e)
             }
     
     def get_voice_list(self) -> list:
@@ -4,22 +4,71 @@ OpenAI TTS Provider 实现
 
 import os
 import tempfile
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
-from .base_tts_provider import TTSProvider
+from .base_tts_provider import TTSProvider, ChunkedFileSink, classify_error
 
 
 class OpenAITTSProvider(TTSProvider):
     """OpenAI TTS Provider"""
     
+    # 读取响应体的块大小
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # 单次请求的最大文本长度
+    MAX_CHUNK_SIZE = 4000
+    
     AVAILABLE_VOICES = [
         'alloy', 'echo', 'fable', 'onyx', 'nova', 'shimmer',
         'coral', 'verse', 'ballad', 'ash', 'sage', 'amuch'
     ]
     
+    # 按 API key 共享的客户端：Provider 实例切换或重建时复用已建立的连接
+    _clients: Dict[str, Any] = {}
+    _clients_lock = threading.Lock()
+    
     def __init__(self, config: Dict[str, Any]):
         config.setdefault('voice', 'alloy')
         config.setdefault('speed', 1.0)
         super().__init__(config)
+        self._client = None
+    
+    def _get_client(self):
+        """获取或创建 OpenAI 客户端（底层 httpx 连接池可跨请求、跨线程共享）"""
+        if self._client is None:
+            with self._clients_lock:
+                client = self._clients.get(self.api_key)
+                if client is None:
+                    import httpx
+                    from openai import OpenAI
+                    
+                    # 连接数不小于分段并发数，避免并发请求互相等待连接；
+                    # 自建 httpx 客户端，超时与重定向设置与 SDK 默认值一致
+                    client = OpenAI(
+                        api_key=self.api_key,
+                        http_client=httpx.Client(
+                            timeout=httpx.Timeout(600.0, connect=5.0),
+                            limits=httpx.Limits(
+                                max_keepalive_connections=self.concurrency,
+                                max_connections=max(16, self.concurrency),
+                                keepalive_expiry=30.0,
+                            ),
+                            follow_redirects=True,
+                        ),
+                    )
+                    self._clients[self.api_key] = client
+            self._client = client
+        return self._client
+    
+    @classmethod
+    def close_clients(cls) -> None:
+        """关闭所有共享客户端，释放连接池"""
+        with cls._clients_lock:
+            for client in cls._clients.values():
+                client.close()
+            cls._clients.clear()
     
     def validate_config(self) -> bool:
         if not self.api_key:
@@ -29,34 +78,61 @@ class OpenAITTSProvider(TTSProvider):
     def synthesize(self, text: str, output_path: str, **kwargs) -> Dict[str, Any]:
         temp_files: List[str] = []
         try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=self.api_key)
+            client = self._get_client()
 
             voice = kwargs.get('voice', self.voice)
             speed = kwargs.get('speed', self.speed)
 
-            max_chunk_size = 4000
-            chunks = self.split_text(text, max_chunk_size)
-
-            for i, chunk in enumerate(chunks):
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-                temp_files.append(temp_file.name)
+            chunks = self.split_text(text, self.MAX_CHUNK_SIZE)
 
-                response = client.audio.speech.create(
+            def _synthesize_chunk(chunk: str, path: str) -> None:
+                # 流式读取响应体并直接写入文件，避免整段音频驻留内存
+                with client.audio.speech.with_streaming_response.create(
                     model="tts-1",
                     voice=voice,
                     input=chunk,
                     speed=speed
-                )
+                ) as response, ChunkedFileSink(path) as sink:
+                    for data in response.iter_bytes(self.STREAM_CHUNK_SIZE):
+                        sink.write(data)
 
-                response.stream_to_file(temp_file.name)
-                temp_file.close()
-
-            if len(temp_files) == 1:
-                os.rename(temp_files[0], output_path)
+            if len(chunks) == 1:
+                # 单段直接写入输出文件，不经过临时文件
+                _synthesize_chunk(chunks[0], output_path)
             else:
-                self._merge_audio_files(temp_files, output_path)
+                # 重复出现的段落（台呼、广告串场等）只合成一次，合并时重复引用同一文件
+                unique: Dict[str, str] = {}
+                chunk_files: List[str] = []
+                # 临时文件放在输出目录中，与输出文件位于同一文件系统
+                temp_dir = os.path.dirname(output_path) or '.'
+                for chunk in chunks:
+                    key = unicodedata.normalize('NFC', chunk).strip()
+                    if key not in unique:
+                        temp_file = tempfile.NamedTemporaryFile(
+                            delete=False, suffix='.mp3', dir=temp_dir
+                        )
+                        temp_files.append(temp_file.name)
+                        temp_file.close()
+                        unique[key] = temp_file.name
+                    chunk_files.append(unique[key])
+
+                # 各段是独立的 HTTPS 请求，并发发出；按提交顺序取结果以保持段落顺序
+                workers = min(len(unique), self.concurrency)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(_synthesize_chunk, chunk, path)
+                        for chunk, path in zip(unique, temp_files)
+                    ]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        # 有一段失败就不再发出剩余请求
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+                self._merge_audio_files(chunk_files, output_path)
 
             duration = self.estimate_duration(text) / speed
 
@@ -70,42 +146,12 @@ class OpenAITTSProvider(TTSProvider):
         except ImportError:
             return {'success': False, 'error': 'openai package not installed'}
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), 'error_class': classify_error(e)}
         finally:
             for temp_file in temp_files:
                 if os.path.exists(temp_file):
                     os.remove(temp_file)
     
-    def _merge_audio_files(self, file_paths: List[str], output_path: str):
-        """合并多个音频文件"""
-        try:
-            from pydub import AudioSegment
-            
-            combined = AudioSegment.empty()
-            for file_path in file_paths:
-                audio = AudioSegment.from_mp3(file_path)
-                combined += audio
-            
-            combined.export(output_path, format="mp3")
-        except ImportError:
-            # 如果没有 pydub，使用 ffmpeg
-            import subprocess
-            
-            list_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
-            for file_path in file_paths:
-                list_file.write(f"file '{file_path}'\n")
-            list_file.close()
-            
-            try:
-                subprocess.run([
-                    'ffmpeg', '-f', 'concat', '-safe', '0',
-                    '-i', list_file.name,
-                    '-acodec', 'copy',
-                    output_path
-                ], check=True, capture_output=True)
-            finally:
-                os.remove(list_file.name)
-    
     def get_voice_list(self) -> list:
         return self.AVAILABLE_VOICES
     
@@ -12,10 +12,15 @@
 import os
 import json
 import uuid
-import asyncio
 import logging
 from typing import Dict, Any, Optional
-from .base_tts_provider import TTSProvider
+from .base_tts_provider import (
+    TTSProvider,
+    ChunkedFileSink,
+    ERROR_NETWORK,
+    classify_error,
+    run_coroutine,
+)
 
 # 导入官方协议模块
 import sys
@@ -71,6 +76,11 @@ class VolcengineTTSProvider(TTSProvider):
         "zh_male_xiaogang": "中文男声-小刚",
     }
 
+    # get_voice_list 的数据，类定义时构建一次；对外只返回副本
+    VOICE_LIST = tuple({"id": k, "name": v} for k, v in AVAILABLE_VOICES.items())
+
+    supports_async = True
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化火山引擎播客 TTS Provider
@@ -118,6 +128,22 @@ class VolcengineTTSProvider(TTSProvider):
         """
         合成语音 (同步接口，内部调用异步实现)
 
+        Args:
+            text: 要合成的文本
+            output_path: 输出文件路径
+
+        Returns:
+            Dict: 包含 success, file_path, duration, error 等字段
+        """
+        # 运行异步协程
+        return run_coroutine(self.synthesize_async(text, output_path, **kwargs))
+
+    async def synthesize_async(
+        self, text: str, output_path: str, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        合成语音 (异步接口，可与其他段落共享事件循环并发执行)
+
         Args:
             text: 要合成的文本
             output_path: 输出文件路径
@@ -126,12 +152,14 @@ class VolcengineTTSProvider(TTSProvider):
             Dict: 包含 success, file_path, duration, error 等字段
         """
         try:
-            # 运行异步协程
-            result = asyncio.run(self._synthesize_async(text, output_path, **kwargs))
-            return result
+            return await self._synthesize_async(text, output_path, **kwargs)
         except Exception as e:
             logger.error(f"Synthesis failed: {e}")
-            return {"success": False, "error": f"Synthesis failed: {str(e)}"}
+            return {
+                "success": False,
+                "error": f"Synthesis failed: {str(e)}",
+                "error_class": classify_error(e),
+            }
 
     async def _synthesize_async(
         self, text: str, output_path: str, **kwargs
@@ -233,7 +261,8 @@ class VolcengineTTSProvider(TTSProvider):
         if not req_params["speaker_info"]["speakers"]:
             req_params["audio_config"]["voice_type"] = kwargs.get("voice", self.voice)
 
-        audio_data = bytearray()
+        # 音频块边收边写入文件，不在内存中拼接完整音频
+        sink: Optional[ChunkedFileSink] = None
         websocket = None
 
         try:
@@ -265,7 +294,6 @@ class VolcengineTTSProvider(TTSProvider):
             await finish_session(websocket, session_id)
 
             # 4. 接收音频数据
-            audio_received = False
             while True:
                 msg = await receive_message(websocket)
 
@@ -274,9 +302,9 @@ class VolcengineTTSProvider(TTSProvider):
                     msg.type == MsgType.AudioOnlyServer
                     and msg.event == EventType.PodcastRoundResponse
                 ):
-                    if not audio_received:
-                        audio_received = True
-                    audio_data.extend(msg.payload)
+                    if sink is None:
+                        sink = ChunkedFileSink(output_path)
+                    sink.write(msg.payload)
                     logger.debug(f"Received audio chunk: {len(msg.payload)} bytes")
 
                 # 错误信息
@@ -301,7 +329,7 @@ class VolcengineTTSProvider(TTSProvider):
                         logger.debug("Session finished")
                         break
 
-            if not audio_received:
+            if sink is None:
                 raise RuntimeError("No audio data received from server")
 
             # 5. 关闭连接
@@ -310,15 +338,14 @@ class VolcengineTTSProvider(TTSProvider):
                 websocket, MsgType.FullServerResponse, EventType.ConnectionFinished
             )
 
-            # 6. 保存音频文件
-            with open(output_path, "wb") as f:
-                f.write(audio_data)
+            # 6. 完成音频文件
+            sink.close()
 
             # 估算时长
             duration = self.estimate_duration(text)
 
             logger.info(
-                f"Synthesis successful: {output_path} ({len(audio_data)} bytes)"
+                f"Synthesis successful: {output_path} ({sink.bytes_written} bytes)"
             )
 
             return {
@@ -326,14 +353,31 @@ class VolcengineTTSProvider(TTSProvider):
                 "file_path": output_path,
                 "duration": duration,
                 "format": self.encoding,
-                "size": len(audio_data),
+                "size": sink.bytes_written,
             }
 
+        except websockets.exceptions.InvalidStatus as e:
+            return {
+                "success": False,
+                "error": f"WebSocket error: {str(e)}",
+                "error_class": classify_error(e),
+            }
         except websockets.exceptions.WebSocketException as e:
-            return {"success": False, "error": f"WebSocket error: {str(e)}"}
+            return {
+                "success": False,
+                "error": f"WebSocket error: {str(e)}",
+                "error_class": ERROR_NETWORK,
+            }
         except Exception as e:
-            return {"success": False, "error": f"Synthesis error: {str(e)}"}
+            return {
+                "success": False,
+                "error": f"Synthesis error: {str(e)}",
+                "error_class": classify_error(e),
+            }
         finally:
+            # 合成中途失败时不保留不完整的文件
+            if sink is not None and not sink.closed:
+                sink.discard()
             if websocket:
                 await websocket.close()
 
@@ -358,60 +402,48 @@ class VolcengineTTSProvider(TTSProvider):
             return self.synthesize(text, output_path, **kwargs)
 
         # 长文本分段合成
-        temp_files = []
+        temp_files = [
+            f"{output_path}.temp.{i}.{self.encoding}" for i in range(len(chunks))
+        ]
 
         try:
-            from pydub import AudioSegment
-
-            for i, chunk in enumerate(chunks):
-                temp_path = f"{output_path}.temp.{i}.{self.encoding}"
-                result = self.synthesize(chunk, temp_path, **kwargs)
+            # 各段在同一事件循环中并发合成（并发数取配置 concurrency）
+            results = self.synthesize_batch(list(zip(chunks, temp_files)), **kwargs)
 
-                if not result["success"]:
-                    # 清理临时文件
-                    for temp_file in temp_files:
-                        if os.path.exists(temp_file):
-                            os.remove(temp_file)
-                    return result
-
-                temp_files.append(temp_path)
+            failed = next((r for r in results if not r["success"]), None)
+            if failed is not None:
+                return failed
 
             # 合并音频文件
-            combined = AudioSegment.empty()
-            for temp_file in temp_files:
-                if self.encoding == "mp3":
-                    audio = AudioSegment.from_mp3(temp_file)
-                else:
-                    audio = AudioSegment.from_wav(temp_file)
-                combined += audio
-
-            # 导出最终文件
-            combined.export(output_path, format=self.encoding)
+            self._merge_audio_files(temp_files, output_path, self.encoding)
 
+        except Exception as e:
+            logger.error(f"Long text synthesis failed: {e}")
+            return {
+                "success": False,
+                "error": f"Long text synthesis failed: {str(e)}",
+                "error_class": classify_error(e),
+            }
+        finally:
             # 清理临时文件
             for temp_file in temp_files:
                 if os.path.exists(temp_file):
                     os.remove(temp_file)
 
-            # 计算总时长
-            total_duration = sum(self.estimate_duration(chunk) for chunk in chunks)
+        # 计算总时长
+        total_duration = sum(self.estimate_duration(chunk) for chunk in chunks)
 
-            return {
-                "success": True,
-                "file_path": output_path,
-                "duration": total_duration,
-                "format": self.encoding,
-                "chunks": len(chunks),
-            }
-
-        except ImportError:
-            # 如果没有 pydub，只合成第一段
-            logger.warning("pydub not installed, only synthesizing first chunk")
-            return self.synthesize(chunks[0], output_path, **kwargs)
+        return {
+            "success": True,
+            "file_path": output_path,
+            "duration": total_duration,
+            "format": self.encoding,
+            "chunks": len(chunks),
+        }
 
     def get_voice_list(self) -> list:
-        """获取可用音色列表"""
-        return [{"id": k, "name": v} for k, v in self.AVAILABLE_VOICES.items()]
+        """获取可用音色列表（副本，调用方修改不影响类属性）"""
+        return [dict(voice) for voice in self.VOICE_LIST]
 
     def get_provider_name(self) -> str:
         """获取 Provider 名称"""
@@ -23,6 +23,7 @@ from src.config import get_config
 from src.content_fetcher import ContentFetcher
 from src.llm_processor import LLMProcessor
 from src.tts_generator import TTSGenerator
+from src.tts_cache import TTSCache
 from src.config import get_config
 from src.file_lock import FileLock
 from src.job_queue import JobQueue
@@ -78,7 +79,8 @@ class Worker:
         if self._tts is None:
             # 只有在真正需要时才调用 get_tts_config
             config = self.config.get_tts_config()
-            self._tts = TTSGenerator(config)
+            cache = TTSCache.from_config(self.config.get_tts_cache_config())
+            self._tts = TTSGenerator(config, cache=cache)
         return self._tts
 
     def _ensure_directories(self):
@@ -158,7 +160,7 @@ class Worker:
         from src.tts_providers import create_tts_provider
 
         episode_id = self._generate_episode_id()
-        start_time = time.time()
+        start_time = time.monotonic()
 
         user_dir = os.path.join(self.paths["episodes_dir"], user_id)
         os.makedirs(user_dir, exist_ok=True)
@@ -176,7 +178,7 @@ class Worker:
                     stage="tts_generating",
                 )
 
-            tts_start = time.time()
+            tts_start = time.monotonic()
             audio_format = self.resources.get("audio_format", "mp3")
             audio_path = os.path.join(user_dir, f"{episode_id}.{audio_format}")
 
@@ -191,7 +193,7 @@ class Worker:
             tts_provider = create_tts_provider(provider_config)
             self._log(f"[{job_id}] Calling TTS synthesize...")
             tts_result = tts_provider.synthesize("", audio_path, **tts_config)
-            tts_duration = time.time() - tts_start
+            tts_duration = time.monotonic() - tts_start
 
             if not tts_result["success"]:
                 error_msg = tts_result.get("error", "Unknown TTS error")
@@ -204,7 +206,7 @@ class Worker:
             if actual_duration <= 0:
                 actual_duration = float(tts_result.get("duration", 0))
 
-            total_duration = time.time() - start_time
+            total_duration = time.monotonic() - start_time
 
             if job_id:
                 self.status_updater.update_job(
@@ -290,7 +292,7 @@ class Worker:
     ) -> dict:
         """处理单个 URL"""
         episode_id = self._generate_episode_id()
-        start_time = time.time()
+        start_time = time.monotonic()
 
         user_dir = os.path.join(self.paths["episodes_dir"], user_id)
         os.makedirs(user_dir, exist_ok=True)
@@ -314,10 +316,10 @@ class Worker:
                     stage="fetching",
                 )
 
-            fetch_start = time.time()
+            fetch_start = time.monotonic()
             self._log("Step 1: Fetching content...")
             content_result = self.fetcher.fetch(url)
-            fetch_duration = time.time() - fetch_start
+            fetch_duration = time.monotonic() - fetch_start
 
             if not content_result["success"]:
                 raise Exception(
@@ -341,10 +343,10 @@ class Worker:
                         stage="llm_processing",
                     )
 
-                llm_start = time.time()
+                llm_start = time.monotonic()
                 self._log("Step 2: Processing with LLM...")
                 llm_result = self.llm.process(title, content)
-                llm_duration = time.time() - llm_start
+                llm_duration = time.monotonic() - llm_start
 
                 if not llm_result["success"]:
                     raise Exception(
@@ -394,7 +396,7 @@ class Worker:
                     stage="tts_generating",
                 )
 
-            tts_start = time.time()
+            tts_start = time.monotonic()
             self._log("Step 3: Generating audio...")
             audio_format = self.resources["audio_format"]
             audio_path = os.path.join(user_dir, f"{episode_id}.{audio_format}")
@@ -402,7 +404,7 @@ class Worker:
             # 传递 tts_config
             tts_params = tts_config or {}
             tts_result = self.tts.generate(script, audio_path, **tts_params)
-            tts_duration = time.time() - tts_start
+            tts_duration = time.monotonic() - tts_start
 
             if not tts_result["success"]:
                 raise Exception(
@@ -419,7 +421,7 @@ class Worker:
             else:
                 actual_duration = float(tts_result.get("duration", 0))
 
-            total_duration = time.time() - start_time
+            total_duration = time.monotonic() - start_time
 
             # 4. 保存元数据
             if job_id:
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Job Status Updater Tests
+Test job status file updates and job ID validation
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.job_status_updater import JobStatusUpdater
+
+
+class TestJobStatusUpdater(unittest.TestCase):
+    """Test cases for JobStatusUpdater"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.updater = JobStatusUpdater(jobs_dir=self.temp_dir)
+
+        self.job_id = "abc123-x_1"
+        self.job_file = os.path.join(self.temp_dir, f"{self.job_id}.json")
+        with open(self.job_file, "w", encoding="utf-8") as f:
+            json.dump({"id": self.job_id, "status": "pending", "progress": 0}, f)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_update_existing_job(self):
+        """Test updating progress and stage of an existing job"""
+        self.assertTrue(
+            self.updater.update_job(self.job_id, progress=40, stage="llm")
+        )
+
+        with open(self.job_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        self.assertEqual(data["progress"], 40)
+        self.assertEqual(data["stage"], "llm")
+        self.assertEqual(len(data["stages"]), 1)
+        self.assertIn("updated_at", data)
+
+    def test_missing_job_returns_false(self):
+        """Test that an unknown job ID is not created"""
+        self.assertFalse(self.updater.update_job("unknown", progress=10))
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "unknown.json")))
+
+    def test_invalid_job_ids_rejected(self):
+        """Test that job IDs with path characters are rejected"""
+        for job_id in ["", "../abc123-x_1", "a/b", "a\x00b", "x" * 65]:
+            with self.subTest(job_id=job_id):
+                self.assertFalse(self.updater.update_job(job_id, progress=10))
+
+
+if __name__ == "__main__":
+    unittest.main()
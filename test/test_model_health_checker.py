@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Model Health Checker Tests
+Test startup probing, failover and failed-model rechecks
+"""
+
+import sys
+import tempfile
+import threading
+import shutil
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.model_health_checker import ModelHealthChecker
+
+
+class TestModelHealthChecker(unittest.TestCase):
+    """Test cases for ModelHealthChecker"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        # provider -> available; edge-tts is always available
+        self.healthy = {"nvidia": True, "openai": True, "volcengine": False}
+
+        def fake_probe(checker, model_type, config):
+            return config.provider == "edge-tts" or self.healthy[config.provider]
+
+        patcher = patch.object(ModelHealthChecker, "_probe", fake_probe)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.checker = ModelHealthChecker(
+            cache_file=str(Path(self.temp_dir) / "cache.json")
+        )
+        self.addCleanup(self.checker.close)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_startup_keeps_priority_order(self):
+        """Test that available models are listed in table order"""
+        self.assertEqual(
+            [m.model for m in self.checker._available_llm],
+            [m.model for m in ModelHealthChecker.LLM_MODELS],
+        )
+        self.assertEqual(
+            [m.provider for m in self.checker._available_tts],
+            ["openai", "edge-tts"],
+        )
+
+    def test_recent_cache_skips_startup_probes(self):
+        """Test that a fresh cache file is reused by the next checker"""
+        self.checker.switch_llm_model()
+        cache_file = str(self.checker.cache_file)
+
+        with patch.object(ModelHealthChecker, "_startup_health_check") as startup:
+            restored = ModelHealthChecker(cache_file=cache_file)
+            self.addCleanup(restored.close)
+
+        startup.assert_not_called()
+        self.assertEqual(restored._available_llm, self.checker._available_llm)
+        self.assertEqual(
+            restored.get_llm_config()["model"],
+            self.checker.get_llm_config()["model"],
+        )
+
+    def test_config_view_does_not_mutate_table(self):
+        """Test that writes to a returned config stay out of the model table"""
+        config = self.checker.get_llm_config()
+        config["api_key"] = "secret"
+        self.assertEqual(config["model"], ModelHealthChecker.LLM_MODELS[0].model)
+        self.assertNotIn("api_key", self.checker.get_llm_config())
+
+    def test_failed_model_removed_after_recheck(self):
+        """Test that a reported model still failing its probe leaves rotation"""
+        self.healthy["nvidia"] = False
+        failed = self.checker.get_llm_config()["model"]
+
+        new_config = self.checker.report_llm_failure()
+        # Wait for the background recheck to finish
+        self.checker._executor.shutdown(wait=True)
+
+        models = [m.model for m in self.checker._available_llm]
+        self.assertNotIn(failed, models)
+        self.assertEqual(self.checker.get_llm_config()["model"], new_config["model"])
+
+    def test_getters_wait_for_state_replacement(self):
+        """Test that get_tts_config reads the list and index under the state lock"""
+        result = []
+        with self.checker._state_lock:
+            reader = threading.Thread(
+                target=lambda: result.append(self.checker.get_tts_config())
+            )
+            reader.start()
+            reader.join(timeout=0.2)
+            self.assertEqual(result, [])
+            # Swap in a shorter list, leaving the old index out of range
+            self.checker._available_tts = self.checker._available_tts[1:]
+            self.checker._current_tts_index = 1
+        reader.join(timeout=5)
+
+        self.assertEqual(result[0]["provider"], "edge-tts")
+        self.assertEqual(self.checker._current_tts_index, 0)
+
+    def test_close_cancels_queued_probes(self):
+        """Test that probes still waiting for a worker are cancelled on close"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        running = [
+            self.checker._submit(release.wait)
+            for _ in ModelHealthChecker.LLM_MODELS + ModelHealthChecker.TTS_MODELS
+        ]
+        queued = self.checker._submit(release.wait)
+
+        self.checker.close()
+        self.assertTrue(queued.cancelled())
+        release.set()
+        self.assertTrue(all(future.result(timeout=5) for future in running))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Retry Utils Tests
+Test which API failures are retried
+"""
+
+import sys
+import unittest
+from unittest.mock import Mock
+from pathlib import Path
+
+import httpx
+import openai
+from tenacity import wait_none
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.retry_utils import _is_retryable, api_retry
+
+
+class TestIsRetryable(unittest.TestCase):
+    """Test cases for _is_retryable"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+
+    def test_sdk_transport_errors_retried(self):
+        """Test that OpenAI SDK and httpx connection failures are retried"""
+        self.assertTrue(_is_retryable(openai.APIConnectionError(request=self.request)))
+        self.assertTrue(_is_retryable(openai.APITimeoutError(request=self.request)))
+        self.assertTrue(_is_retryable(httpx.ConnectError("refused", request=self.request)))
+        self.assertTrue(_is_retryable(httpx.ReadTimeout("timed out", request=self.request)))
+
+    def test_status_codes(self):
+        """Test that 5xx and 429 are retried but other client errors are not"""
+        def http_error(status_code):
+            error = Exception("http error")
+            error.response = Mock(status_code=status_code)
+            return error
+
+        self.assertTrue(_is_retryable(http_error(503)))
+        self.assertTrue(_is_retryable(http_error(429)))
+        self.assertFalse(_is_retryable(http_error(400)))
+        self.assertFalse(_is_retryable(ValueError("bad input")))
+
+    def test_api_retry_retries_connection_error(self):
+        """Test that api_retry calls again after an SDK connection error"""
+        calls = Mock(side_effect=[openai.APIConnectionError(request=self.request), "ok"])
+
+        @api_retry
+        def call():
+            return calls()
+
+        self.assertEqual(call.retry_with(wait=wait_none())(), "ok")
+        self.assertEqual(calls.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+RSS Generator Tests
+Test feed generation and saving
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.rss_generator import RSSGenerator
+
+ITUNES_NS = {"itunes": "http://www.itunes.com/dtds/podcast-1.0.dtd"}
+
+
+class TestRSSGenerator(unittest.TestCase):
+    """Test cases for RSSGenerator"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            "podcast": {"title": "Test & Co", "base_url": "http://example.com"},
+            "resources": {"audio_format": "mp3"},
+        }
+        self.episodes = [
+            {
+                "id": f"ep{i}",
+                "title": f"第 {i} 期",
+                "created": datetime(2024, 1, i + 1, 8, 30, 0),
+                "audio_file": f"episodes/default/ep{i}.mp3",
+                "size_mb": 1,
+                "duration": 3725,
+            }
+            for i in range(2)
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generate_feed(self):
+        """Test that the generated feed is well-formed and complete"""
+        xml = RSSGenerator(self.config).generate(self.episodes)
+        self.assertTrue(xml.startswith('<?xml version="1.0" encoding="UTF-8"?>'))
+
+        channel = ET.fromstring(xml.split("\n", 1)[1]).find("channel")
+        self.assertEqual(channel.findtext("title"), "Test & Co")
+        items = channel.findall("item")
+        self.assertEqual([item.findtext("guid") for item in items], ["ep0", "ep1"])
+        self.assertEqual(items[0].findtext("pubDate"), "Mon, 01 Jan 2024 08:30:00 +0000")
+        self.assertEqual(
+            items[0].findtext("itunes:duration", namespaces=ITUNES_NS), "1:02:05"
+        )
+        self.assertEqual(
+            items[0].find("enclosure").get("url"),
+            "http://example.com/episodes/default/ep0.mp3",
+        )
+
+    def test_channel_info_follows_config(self):
+        """Test that cached channel info is not shared across podcast configs"""
+        other = {"podcast": {"title": "Other", "base_url": "http://other.org"}}
+        RSSGenerator(self.config).generate(self.episodes)
+        xml = RSSGenerator(other).generate([])
+
+        channel = ET.fromstring(xml.split("\n", 1)[1]).find("channel")
+        self.assertEqual(channel.findtext("title"), "Other")
+        self.assertEqual(channel.findtext("image/url"), "http://other.org/cover.jpg")
+
+    def test_channel_info_not_shared_between_feeds(self):
+        """Test that each feed gets its own channel info elements"""
+        first = RSSGenerator(self.config)._build_rss(self.episodes)
+        second = RSSGenerator(self.config)._build_rss([])
+
+        self.assertIsNot(first.find("channel/title"), second.find("channel/title"))
+        self.assertIsNot(first.find("channel/image"), second.find("channel/image"))
+        self.assertEqual(second.findtext("channel/image/title"), "Test & Co")
+
+    def test_duplicate_episodes_listed_once(self):
+        """Test that episodes sharing an ID produce a single item"""
+        episodes = self.episodes + [dict(self.episodes[0], title="duplicate")]
+        xml = RSSGenerator(self.config).generate(episodes)
+
+        items = ET.fromstring(xml.split("\n", 1)[1]).findall("channel/item")
+        self.assertEqual([item.findtext("title") for item in items], ["第 0 期", "第 1 期"])
+
+    def test_save_rss(self):
+        """Test that save_rss writes the feed to the given path"""
+        output_path = os.path.join(self.temp_dir, "user", "feed.xml")
+        generator = RSSGenerator(self.config)
+        self.assertEqual(generator.save_rss(self.episodes, output_path), output_path)
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        self.assertTrue(content.startswith("<?xml"))
+        channel = ET.fromstring(content.split("\n", 1)[1]).find("channel")
+        self.assertEqual(len(channel.findall("item")), 2)
+
+    def test_save_rss_skips_unchanged_feed(self):
+        """Test that an unchanged episode list does not rebuild the feed"""
+        output_path = os.path.join(self.temp_dir, "feed.xml")
+        generator = RSSGenerator(self.config)
+        generator.save_rss(self.episodes, output_path)
+
+        with patch.object(RSSGenerator, "_build_rss", wraps=generator._build_rss) as build:
+            RSSGenerator(self.config).save_rss(self.episodes, output_path)
+            build.assert_not_called()
+
+            RSSGenerator(self.config).save_rss(self.episodes[:1], output_path)
+            build.assert_called_once()
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            channel = ET.fromstring(f.read().split("\n", 1)[1]).find("channel")
+        self.assertEqual(len(channel.findall("item")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Trigger Server Tests
+Test static file serving and the webhook endpoint
+"""
+
+import http.client
+import os
+import sys
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.server import (
+    MAX_BODY_BYTES,
+    BoundedThreadingHTTPServer,
+    WebhookHandler,
+    parse_byte_range,
+)
+
+
+class TestParseByteRange(unittest.TestCase):
+    """Test cases for parse_byte_range"""
+
+    def test_ranges(self):
+        """Test explicit, open-ended and suffix ranges"""
+        self.assertEqual(parse_byte_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_byte_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=90-200", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_byte_range("bytes=-200", 100), (0, 99))
+
+    def test_ignored_ranges(self):
+        """Test that malformed or multi-part ranges fall back to the full file"""
+        for header in ["bytes=-", "bytes=5-2", "items=0-1", "bytes=0-1,5-6"]:
+            with self.subTest(header=header):
+                self.assertIsNone(parse_byte_range(header, 100))
+
+    def test_unsatisfiable_ranges(self):
+        """Test that ranges past the end of the file are rejected"""
+        for header in ["bytes=100-", "bytes=-0"]:
+            with self.subTest(header=header):
+                with self.assertRaises(ValueError):
+                    parse_byte_range(header, 100)
+
+
+class TestWebhookHandler(unittest.TestCase):
+    """Test cases for WebhookHandler served over a real socket"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.old_cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+
+        os.makedirs("episodes")
+        self.audio = bytes(range(256)) * 4
+        with open("episodes/test.mp3", "wb") as f:
+            f.write(self.audio)
+
+        self.queue_file = os.path.join(self.temp_dir, "queue.txt")
+        WebhookHandler.config = {"queue_file": self.queue_file, "port": 0}
+        WebhookHandler.log_message = lambda *args: None
+        WebhookHandler._index_cache = None
+
+        self.server = BoundedThreadingHTTPServer(
+            ("127.0.0.1", 0), WebhookHandler, max_workers=2
+        )
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self.thread.start()
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.server.shutdown()
+        self.server.server_close()
+        del WebhookHandler.log_message
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request and return (status, headers, body)"""
+        conn = http.client.HTTPConnection(
+            "127.0.0.1", self.server.server_port, timeout=5
+        )
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            conn.close()
+
+    def test_static_file(self):
+        """Test serving a whole file"""
+        status, headers, body = self.request("GET", "/episodes/test.mp3")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], "audio/mpeg")
+        self.assertEqual(headers["Accept-Ranges"], "bytes")
+        self.assertEqual(body, self.audio)
+
+    def test_static_file_not_found(self):
+        """Test that missing files and directories return 404"""
+        for path in ["/episodes/missing.mp3", "/episodes/"]:
+            with self.subTest(path=path):
+                self.assertEqual(self.request("GET", path)[0], 404)
+
+    def test_static_file_outside_episodes_rejected(self):
+        """Test that paths escaping the episodes directory are refused"""
+        with open("config.yaml", "w", encoding="utf-8") as f:
+            f.write("api_key: secret\n")
+        for path in ["/episodes/../config.yaml", "/episodes/./../config.yaml"]:
+            with self.subTest(path=path):
+                status, _, body = self.request("GET", path)
+                self.assertEqual(status, 403)
+                self.assertNotIn(b"secret", body)
+
+    def test_static_file_range(self):
+        """Test serving part of a file"""
+        status, headers, body = self.request(
+            "GET", "/episodes/test.mp3", headers={"Range": "bytes=10-19"}
+        )
+        self.assertEqual(status, 206)
+        self.assertEqual(headers["Content-Range"], f"bytes 10-19/{len(self.audio)}")
+        self.assertEqual(body, self.audio[10:20])
+
+        status, headers, _ = self.request(
+            "GET", "/episodes/test.mp3", headers={"Range": "bytes=5000-"}
+        )
+        self.assertEqual(status, 416)
+        self.assertEqual(headers["Content-Range"], f"bytes */{len(self.audio)}")
+
+    def test_static_file_etag(self):
+        """Test that a matching If-None-Match gets 304 without a body"""
+        status, headers, _ = self.request("GET", "/episodes/test.mp3")
+        etag = headers["ETag"]
+        self.assertEqual(headers["Cache-Control"], "public, max-age=3600")
+
+        status, headers, body = self.request(
+            "GET", "/episodes/test.mp3", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(status, 304)
+        self.assertEqual(body, b"")
+
+        with open("episodes/test.mp3", "ab") as f:
+            f.write(b"more")
+        status, headers, _ = self.request(
+            "GET", "/episodes/test.mp3", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(status, 200)
+        self.assertNotEqual(headers["ETag"], etag)
+
+    def test_static_file_error_after_headers_closes_connection(self):
+        """Test that a failure mid-body closes the connection without a 500"""
+        with patch.object(socket.socket, "sendfile", side_effect=OSError("boom")):
+            conn = http.client.HTTPConnection(
+                "127.0.0.1", self.server.server_port, timeout=5
+            )
+            self.addCleanup(conn.close)
+            conn.request("GET", "/episodes/test.mp3")
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            with self.assertRaises(http.client.IncompleteRead) as cm:
+                response.read()
+            self.assertNotIn(b"error", cm.exception.partial)
+
+    def test_keep_alive(self):
+        """Test that several GET requests share one connection"""
+        conn = http.client.HTTPConnection(
+            "127.0.0.1", self.server.server_port, timeout=5
+        )
+        self.addCleanup(conn.close)
+        for path in ["/health", "/episodes/test.mp3", "/missing"]:
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            self.assertFalse(response.will_close)
+
+    def test_idle_keep_alive_connections_hold_no_slots(self):
+        """Test that idle persistent connections do not block new requests"""
+        with patch.object(WebhookHandler, "timeout", 30):
+            for _ in range(3):
+                conn = http.client.HTTPConnection(
+                    "127.0.0.1", self.server.server_port, timeout=5
+                )
+                self.addCleanup(conn.close)
+                conn.request("GET", "/health")
+                conn.getresponse().read()
+
+            status, _, _ = self.request("GET", "/health")
+            self.assertEqual(status, 200)
+
+    def test_idle_connection_does_not_block(self):
+        """Test that a stalled client does not hold up other requests"""
+        stalled = socket.create_connection(("127.0.0.1", self.server.server_port))
+        self.addCleanup(stalled.close)
+
+        status, _, body = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertIn(b'"status":"ok"', body)
+
+    @unittest.skipUnless(hasattr(socket, "SO_REUSEPORT"), "SO_REUSEPORT not supported")
+    def test_reuse_port_allows_second_server(self):
+        """Test that reuse_port lets another server bind the same port"""
+        first = BoundedThreadingHTTPServer(
+            ("127.0.0.1", 0), WebhookHandler, reuse_port=True
+        )
+        self.addCleanup(first.server_close)
+        second = BoundedThreadingHTTPServer(
+            ("127.0.0.1", first.server_port), WebhookHandler, reuse_port=True
+        )
+        self.addCleanup(second.server_close)
+        self.assertEqual(first.server_port, second.server_port)
+
+    def test_reuse_port_unsupported(self):
+        """Test that reuse_port fails loudly where SO_REUSEPORT is missing"""
+        with patch("src.server.socket", spec=["SOL_SOCKET"]):
+            with self.assertRaises(OSError):
+                BoundedThreadingHTTPServer(
+                    ("127.0.0.1", 0), WebhookHandler, reuse_port=True
+                )
+
+    def test_index_page_follows_file(self):
+        """Test that the index page falls back to the default and tracks edits"""
+        status, _, body = self.request("GET", "/")
+        self.assertEqual(status, 200)
+        self.assertIn(b"GhostRadio Trigger Server", body)
+
+        with open("episodes/index.html", "w", encoding="utf-8") as f:
+            f.write("<p>v1</p>")
+        self.assertEqual(self.request("GET", "/")[2], b"<p>v1</p>")
+
+        with open("episodes/index.html", "w", encoding="utf-8") as f:
+            f.write("<p>version 2</p>")
+        self.assertEqual(self.request("GET", "/")[2], b"<p>version 2</p>")
+
+    def test_webhook_appends_to_queue(self):
+        """Test that webhook URLs are appended to the queue file"""
+        for url in ["https://example.com/a", "https://example.com/b"]:
+            status, _, _ = self.request(
+                "POST", "/webhook", body=f'{{"url": "{url}"}}'.encode("utf-8")
+            )
+            self.assertEqual(status, 200)
+
+        with open(self.queue_file, "r", encoding="utf-8") as f:
+            urls = [line.split("|", 1)[1] for line in f.read().splitlines()]
+        self.assertEqual(urls, ["https://example.com/a", "https://example.com/b"])
+
+    def test_webhook_accepts_plain_text_url(self):
+        """Test that a non-JSON body is taken as the URL itself"""
+        status, _, body = self.request("POST", "/webhook", body=b"https://example.com/c\n")
+        self.assertEqual(status, 200)
+        self.assertIn(b'"success":true', body)
+
+        with open(self.queue_file, "r", encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith("|https://example.com/c\n"))
+
+    def test_oversized_body_rejected(self):
+        """Test that a body larger than MAX_BODY_BYTES is refused unread"""
+        status, _, _ = self.request(
+            "POST",
+            "/webhook",
+            body=b"x",
+            headers={"Content-Length": str(MAX_BODY_BYTES + 1)},
+        )
+        self.assertEqual(status, 413)
+        self.assertFalse(os.path.exists(self.queue_file))
+
+    def test_webhook_rejects_invalid_url(self):
+        """Test that non-HTTP, blank-containing and overlong URLs are rejected"""
+        for url in ["ftp://x", "https://", "https://a b", "https://" + "a" * 2001]:
+            with self.subTest(url=url[:20]):
+                body = f'{{"url": "{url}"}}'.encode("utf-8")
+                status, _, _ = self.request("POST", "/webhook", body=body)
+                self.assertEqual(status, 400)
+        self.assertFalse(os.path.exists(self.queue_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+TTS Cache Tests
+Test the content-addressed TTS cache and its use in TTSGenerator
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.tts_cache import TTSCache, make_cache_key
+from src.tts_generator import TTSGenerator
+from src.tts_providers.base_tts_provider import TTSProvider
+
+
+class CountingTTSProvider(TTSProvider):
+    """TTS Provider that writes the text as audio and counts calls"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = []
+
+    def validate_config(self) -> bool:
+        return True
+
+    def synthesize(self, text: str, output_path: str, **kwargs) -> dict:
+        self.calls.append(text)
+        with open(output_path, "wb") as f:
+            f.write(text.encode("utf-8"))
+        return {"success": True, "file_path": output_path, "duration": 1.0}
+
+    def get_provider_name(self) -> str:
+        return "counting"
+
+
+class TestTTSCache(unittest.TestCase):
+    """Test cases for TTSCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cache_key(self):
+        """Test that equivalent text shares a key and audio settings do not"""
+        provider = CountingTTSProvider({"voice": "a"})
+        key = make_cache_key(provider, "  你好\n", {})
+        self.assertEqual(key, make_cache_key(provider, "你好", {"token": "secret"}))
+        self.assertNotEqual(key, make_cache_key(provider, "你好", {"speed": 1.5}))
+        self.assertNotEqual(
+            key, make_cache_key(CountingTTSProvider({"voice": "b"}), "你好", {})
+        )
+
+    def _audio_file(self, data: bytes) -> str:
+        """Write data to a temporary audio file and return its path"""
+        fd, path = tempfile.mkstemp(dir=self.temp_dir, suffix=".mp3")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_disk_tier_survives_new_instance(self):
+        """Test that cached audio is served from disk by a fresh cache"""
+        TTSCache(self.cache_dir).store_file("ab" * 32, self._audio_file(b"audio"))
+
+        cache = TTSCache(self.cache_dir, memory_bytes=0)
+        output_path = os.path.join(self.temp_dir, "out.mp3")
+        self.assertTrue(cache.fetch_to_file("ab" * 32, output_path))
+        with open(output_path, "rb") as f:
+            self.assertEqual(f.read(), b"audio")
+        self.assertFalse(cache.fetch_to_file("cd" * 32, output_path))
+
+    def test_disk_eviction(self):
+        """Test that the least recently used entries are evicted over the limit"""
+        cache = TTSCache(self.cache_dir, memory_bytes=0, max_disk_bytes=25)
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.store_file(key, self._audio_file(b"x" * 10))
+            os.utime(cache._path(key), (i, i))
+
+        cache.store_file("99" * 32, self._audio_file(b"x" * 10))
+        self.assertFalse(os.path.exists(cache._path(keys[0])))
+        self.assertFalse(os.path.exists(cache._path(keys[1])))
+        self.assertTrue(os.path.exists(cache._path("99" * 32)))
+
+    def test_overwrite_does_not_grow_disk_usage(self):
+        """Test that storing an existing key counts only the new file"""
+        cache = TTSCache(self.cache_dir, memory_bytes=0)
+        cache.store_file("ab" * 32, self._audio_file(b"x" * 5))
+        for _ in range(5):
+            cache.store_file("cd" * 32, self._audio_file(b"y" * 10))
+
+        self.assertEqual(cache._disk_used, 15)
+
+
+class TestTTSGeneratorCache(unittest.TestCase):
+    """Test cases for TTSGenerator with a cache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {"provider": "counting", "api_key": "test_key"}
+        self.provider = CountingTTSProvider(self.config)
+        patcher = patch(
+            "src.tts_generator.create_tts_provider", return_value=self.provider
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cache = TTSCache(os.path.join(self.temp_dir, "cache"))
+        self.generator = TTSGenerator(self.config, cache=cache)
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_repeated_text_hits_cache(self):
+        """Test that identical text is synthesized once"""
+        paths = [os.path.join(self.temp_dir, f"{i}.mp3") for i in range(2)]
+        for path in paths:
+            result = self.generator.generate("欢迎收听", path)
+            self.assertTrue(result["success"])
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), "欢迎收听".encode("utf-8"))
+
+        self.assertEqual(self.provider.calls, ["欢迎收听"])
+
+
+if __name__ == "__main__":
+    unittest.main()
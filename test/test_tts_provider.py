@@ -6,7 +6,12 @@ Test all TTS providers for functionality and edge cases
 
 import os
 import sys
+import json
+import shutil
+import asyncio
+import tempfile
 import unittest
+import subprocess
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
@@ -16,6 +21,7 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.tts_generator import TTSGenerator, TTSError
+from src.tts_providers.base_tts_provider import ChunkedFileSink, TTSProvider, classify_error
 
 
 class MockTTSProvider:
@@ -220,6 +226,400 @@ class TestTTSProvider(unittest.TestCase):
                 self.assertGreater(result['duration'], 0)
 
 
+class TestTTSErrorClassification(unittest.TestCase):
+    """Test that generate() handles failures by error class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_config = {
+            'provider': 'mock_tts',
+            'voice': 'mock_voice_1',
+            'api_key': 'test_key'
+        }
+        self.test_output = "test_output.wav"
+    
+    def tearDown(self):
+        """Clean up test files"""
+        if os.path.exists(self.test_output):
+            os.remove(self.test_output)
+    
+    def test_classify_error(self):
+        """Test classification of exceptions raised by providers"""
+        def http_error(status_code):
+            error = Exception("http error")
+            error.response = Mock(status_code=status_code)
+            return error
+        
+        self.assertEqual(classify_error(http_error(400)), 'client')
+        self.assertEqual(classify_error(http_error(429)), 'rate_limit')
+        self.assertEqual(classify_error(http_error(503)), 'server')
+        self.assertEqual(classify_error(TimeoutError()), 'network')
+        self.assertEqual(classify_error(ConnectionResetError()), 'network')
+        self.assertEqual(classify_error(FileNotFoundError("no dir")), 'io')
+        self.assertEqual(classify_error(OSError(28, "No space left")), 'io')
+        self.assertEqual(classify_error(ValueError("empty text")), 'client')
+        self.assertEqual(classify_error(json.JSONDecodeError("bad", "{", 0)), 'server')
+        self.assertEqual(classify_error(UnicodeDecodeError("utf-8", b"\xff", 0, 1, "bad")), 'server')
+        self.assertEqual(classify_error(RuntimeError("boom")), 'server')
+        
+        import httpx
+        self.assertEqual(classify_error(httpx.ConnectError("refused")), 'network')
+    
+    def test_classify_socket_timeout(self):
+        """Test that socket.timeout counts as a network error (an OSError on Python 3.8)"""
+        class LegacySocketTimeout(OSError):
+            pass
+        
+        with patch('src.tts_providers.base_tts_provider.socket.timeout', LegacySocketTimeout):
+            self.assertEqual(classify_error(LegacySocketTimeout("timed out")), 'network')
+    
+    def test_classify_ffmpeg_errors(self):
+        """Test that a failed or missing ffmpeg is a local I/O error"""
+        failed = subprocess.CalledProcessError(1, ['ffmpeg'], stderr=b"Invalid data")
+        self.assertEqual(classify_error(failed), 'io')
+        missing = FileNotFoundError(2, "No such file or directory", 'ffmpeg')
+        self.assertEqual(classify_error(missing), 'io')
+    
+    def test_io_error_retries_same_provider(self):
+        """Test that local file errors do not mark the provider as failed"""
+        provider = MockTTSProvider(self.test_config)
+        failed = {'success': False, 'error': 'No such file', 'error_class': 'io'}
+        ok = {'success': True, 'file_path': self.test_output, 'duration': 1.0}
+        provider.synthesize = Mock(side_effect=[failed, ok])
+        
+        with patch('src.tts_generator.get_health_checker') as mock_health:
+            with patch('src.tts_generator.create_tts_provider', return_value=provider):
+                generator = TTSGenerator(self.test_config)
+                result = generator.generate("Hello", self.test_output)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(provider.synthesize.call_count, 2)
+        mock_health.return_value.report_tts_failure.assert_not_called()
+    
+    def test_client_error_not_retried(self):
+        """Test that client errors return without switching provider"""
+        provider = MockTTSProvider(self.test_config)
+        provider.synthesize = Mock(return_value={
+            'success': False, 'error': 'invalid voice', 'error_class': 'client'
+        })
+        
+        with patch('src.tts_generator.get_health_checker') as mock_health:
+            with patch('src.tts_generator.create_tts_provider', return_value=provider):
+                generator = TTSGenerator(self.test_config)
+                result = generator.generate("Hello", self.test_output)
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error'], 'invalid voice')
+        self.assertEqual(provider.synthesize.call_count, 1)
+        mock_health.return_value.report_tts_failure.assert_not_called()
+    
+    def test_rate_limit_retries_same_provider(self):
+        """Test that rate-limited requests back off and retry the same provider"""
+        provider = MockTTSProvider(self.test_config)
+        limited = {'success': False, 'error': 'slow down', 'error_class': 'rate_limit'}
+        ok = {'success': True, 'file_path': self.test_output, 'duration': 1.0}
+        provider.synthesize = Mock(side_effect=[limited, ok])
+        
+        with patch('src.tts_generator.get_health_checker') as mock_health:
+            with patch('src.tts_generator.create_tts_provider', return_value=provider):
+                with patch('src.tts_generator.time.sleep') as mock_sleep:
+                    generator = TTSGenerator(self.test_config)
+                    result = generator.generate("Hello", self.test_output)
+        
+        self.assertTrue(result['success'])
+        self.assertEqual(provider.synthesize.call_count, 2)
+        mock_sleep.assert_called_once_with(1)
+        mock_health.return_value.report_tts_failure.assert_not_called()
+
+
+class TestChunkedFileSink(unittest.TestCase):
+    """Test ChunkedFileSink"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "audio.mp3")
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_writes_chunks(self):
+        """Test that chunks are written in order and counted"""
+        with ChunkedFileSink(self.path) as sink:
+            sink.write(b"abc")
+            sink.write(b"defg")
+        
+        self.assertTrue(sink.closed)
+        self.assertEqual(sink.bytes_written, 7)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"abcdefg")
+    
+    def test_discards_partial_file_on_error(self):
+        """Test that an interrupted write leaves no file behind"""
+        with self.assertRaises(RuntimeError):
+            with ChunkedFileSink(self.path) as sink:
+                sink.write(b"partial")
+                raise RuntimeError("connection lost")
+        
+        self.assertFalse(os.path.exists(self.path))
+
+
+class TestOpenAITTSProviderChunks(unittest.TestCase):
+    """Test chunked synthesis in OpenAITTSProvider"""
+    
+    def test_chunks_synthesized_in_parallel_and_merged_in_order(self):
+        """Test that long text chunks run concurrently and keep their order"""
+        from contextlib import contextmanager
+        import threading
+        from src.tts_providers.openai_tts_provider import OpenAITTSProvider
+        
+        provider = OpenAITTSProvider({'api_key': 'test_key', 'concurrency': 3})
+        barrier = threading.Barrier(3, timeout=5)
+        
+        @contextmanager
+        def fake_create(model, voice, input, speed):
+            barrier.wait()  # Blocks unless three requests are in flight at once
+            response = Mock()
+            response.iter_bytes.return_value = [input[:2].encode('utf-8')]
+            yield response
+        
+        client = MagicMock()
+        client.audio.speech.with_streaming_response.create = fake_create
+        provider._client = client
+        
+        merged = []
+        def fake_merge(paths, output_path):
+            for path in paths:
+                with open(path, 'rb') as f:
+                    merged.append(f.read())
+        
+        with patch.object(provider, 'split_text', return_value=['A1.', 'B2.', 'C3.']):
+            with patch.object(provider, '_merge_audio_files', side_effect=fake_merge):
+                result = provider.synthesize("long text", "out.mp3")
+        
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(merged, [b'A1', b'B2', b'C3'])
+    
+    def test_single_chunk_written_directly(self):
+        """Test that short text streams straight into the output file"""
+        from contextlib import contextmanager
+        from src.tts_providers.openai_tts_provider import OpenAITTSProvider
+        
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        output_path = os.path.join(temp_dir, "out.mp3")
+        
+        @contextmanager
+        def fake_create(model, voice, input, speed):
+            response = Mock()
+            response.iter_bytes.return_value = [b'mp3', b'data']
+            yield response
+        
+        provider = OpenAITTSProvider({'api_key': 'test_key'})
+        provider._client = MagicMock()
+        provider._client.audio.speech.with_streaming_response.create = fake_create
+        
+        with patch('src.tts_providers.openai_tts_provider.tempfile.NamedTemporaryFile') as temp:
+            result = provider.synthesize("short", output_path)
+        
+        self.assertTrue(result['success'], result.get('error'))
+        temp.assert_not_called()
+        self.assertEqual(os.listdir(temp_dir), ["out.mp3"])
+        with open(output_path, 'rb') as f:
+            self.assertEqual(f.read(), b'mp3data')
+    
+    def test_repeated_chunks_synthesized_once(self):
+        """Test that identical chunks share one request and one audio file"""
+        from contextlib import contextmanager
+        from src.tts_providers.openai_tts_provider import OpenAITTSProvider
+        
+        inputs = []
+        
+        @contextmanager
+        def fake_create(model, voice, input, speed):
+            inputs.append(input)
+            response = Mock()
+            response.iter_bytes.return_value = [input.strip().encode('utf-8')]
+            yield response
+        
+        provider = OpenAITTSProvider({'api_key': 'test_key'})
+        provider._client = MagicMock()
+        provider._client.audio.speech.with_streaming_response.create = fake_create
+        
+        merged = []
+        def fake_merge(paths, output_path):
+            for path in paths:
+                with open(path, 'rb') as f:
+                    merged.append(f.read())
+        
+        chunks = ['Station ID.', 'News.', ' Station ID.', 'Station ID.']
+        with patch.object(provider, 'split_text', return_value=chunks):
+            with patch.object(provider, '_merge_audio_files', side_effect=fake_merge):
+                result = provider.synthesize("long text", "out.mp3")
+        
+        self.assertTrue(result['success'], result.get('error'))
+        self.assertEqual(sorted(inputs), ['News.', 'Station ID.'])
+        self.assertEqual(merged, [b'Station ID.', b'News.', b'Station ID.', b'Station ID.'])
+
+
+class TestOpenAITTSProviderClient(unittest.TestCase):
+    """Test OpenAI client reuse in OpenAITTSProvider"""
+    
+    def test_client_shared_per_api_key(self):
+        """Test that providers with the same key share one client"""
+        from src.tts_providers.openai_tts_provider import OpenAITTSProvider
+        self.addCleanup(OpenAITTSProvider.close_clients)
+        
+        first = OpenAITTSProvider({'api_key': 'key-a'})._get_client()
+        second = OpenAITTSProvider({'api_key': 'key-a'})._get_client()
+        other = OpenAITTSProvider({'api_key': 'key-b'})._get_client()
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+
+class TestEdgeTTSBatch(unittest.TestCase):
+    """Test batch synthesis through EdgeTTSProvider"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        from src.tts_providers.edge_tts_provider import EdgeTTSProvider
+        
+        self.provider = EdgeTTSProvider({'concurrency': 2})
+        self.active = 0
+        self.max_active = 0
+        
+        async def fake_synthesize_async(text, output_path, **kwargs):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            if text == "bad":
+                raise RuntimeError("connection reset")
+            return {'success': True, 'file_path': output_path}
+        
+        self.provider.synthesize_async = fake_synthesize_async
+    
+    def test_synthesize_batch(self):
+        """Test that a batch runs on one loop with bounded concurrency"""
+        items = [("a", "a.mp3"), ("bad", "b.mp3"), ("c", "c.mp3"), ("d", "d.mp3")]
+        results = self.provider.synthesize_batch(items)
+        
+        self.assertEqual([r['success'] for r in results], [True, False, True, True])
+        self.assertEqual(results[2]['file_path'], "c.mp3")
+        self.assertEqual(self.max_active, 2)
+    
+    def test_synthesize_inside_running_loop(self):
+        """Test that the sync API still works when called from a coroutine"""
+        async def caller():
+            return self.provider.synthesize("a", "a.mp3")
+        
+        self.assertTrue(asyncio.run(caller())['success'])
+
+
+class TestSyncProviderBatch(unittest.TestCase):
+    """Test batch synthesis through a provider without native async support"""
+    
+    def test_synthesize_batch_uses_threads(self):
+        """Test that the default synthesize_async runs synthesize concurrently"""
+        class SyncProvider(TTSProvider):
+            def validate_config(self):
+                return True
+            
+            def synthesize(self, text, output_path, **kwargs):
+                if text == "bad":
+                    raise RuntimeError("connection reset")
+                return {'success': True, 'file_path': output_path, 'speed': kwargs['speed']}
+        
+        provider = SyncProvider({'concurrency': 2})
+        self.assertFalse(provider.supports_async)
+        
+        items = [("a", "a.mp3"), ("bad", "b.mp3"), ("c", "c.mp3")]
+        results = provider.synthesize_batch(items, speed=1.2)
+        
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertEqual(results[2], {'success': True, 'file_path': "c.mp3", 'speed': 1.2})
+        self.assertEqual(results[1]['error_class'], 'server')
+
+
+class TestVolcengineVoiceList(unittest.TestCase):
+    """Test VolcengineTTSProvider.get_voice_list"""
+    
+    def test_voice_list_is_a_copy(self):
+        """Test that changing the returned voice list leaves the class data intact"""
+        from src.tts_providers.volcengine_provider import VolcengineTTSProvider
+        
+        # get_voice_list only reads class data, so skip __init__ and its config validation
+        provider = VolcengineTTSProvider.__new__(VolcengineTTSProvider)
+        voices = provider.get_voice_list()
+        voices[0]['name'] = "changed"
+        voices.clear()
+        
+        fresh = provider.get_voice_list()
+        self.assertEqual(len(fresh), len(VolcengineTTSProvider.AVAILABLE_VOICES))
+        self.assertEqual(fresh[0]['name'], VolcengineTTSProvider.AVAILABLE_VOICES[fresh[0]['id']])
+
+
+class TestSplitText(unittest.TestCase):
+    """Test TTSProvider.split_text"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        from src.tts_providers.edge_tts_provider import EdgeTTSProvider
+        self.provider = EdgeTTSProvider({})
+    
+    def test_splits_on_sentence_boundaries(self):
+        """Test that chunks end at Chinese and English sentence punctuation"""
+        text = "第一句。第二句！Third one. Fourth?\n第五段"
+        chunks = self.provider.split_text(text, max_length=12)
+        
+        self.assertEqual(chunks, ["第一句。第二句！", "Third one.", " Fourth?\n第五段"])
+        self.assertEqual("".join(chunks), text)
+    
+    def test_chunk_may_fill_limit_exactly(self):
+        """Test that a chunk of exactly max_length characters is kept whole"""
+        self.assertEqual(self.provider.split_text("一二三。四五六。", 4), ["一二三。", "四五六。"])
+    
+    def test_newlines_stay_with_sentence(self):
+        """Test that newline runs never become whitespace-only chunks"""
+        self.assertEqual(self.provider.split_text("ab。\n\n\ncd。", 3), ["ab。", "cd。"])
+        self.assertEqual(
+            self.provider.split_text("ab。\n\n\ncd。", 6), ["ab。\n\n\n", "cd。"]
+        )
+    
+    def test_long_sentence_is_cut(self):
+        """Test that a sentence longer than max_length is cut to size"""
+        chunks = self.provider.split_text("字" * 25, max_length=10)
+        self.assertEqual([len(c) for c in chunks], [10, 10, 5])
+
+
+class TestMergeAudioFiles(unittest.TestCase):
+    """Test TTSProvider._merge_audio_files"""
+    
+    def test_ffmpeg_stream_copy(self):
+        """Test that ffmpeg concatenates with stream copy and quoted paths"""
+        from src.tts_providers.edge_tts_provider import EdgeTTSProvider
+        
+        provider = EdgeTTSProvider({})
+        captured = {}
+        
+        def fake_run(cmd, **kwargs):
+            captured['cmd'] = cmd
+            with open(cmd[cmd.index('-i') + 1], encoding='utf-8') as f:
+                captured['list'] = f.read()
+        
+        with patch('src.tts_providers.base_tts_provider.shutil.which', return_value='/usr/bin/ffmpeg'):
+            with patch('src.tts_providers.base_tts_provider.subprocess.run', side_effect=fake_run):
+                provider._merge_audio_files(['/tmp/a.mp3', "/tmp/it's.mp3"], 'out.mp3')
+        
+        self.assertEqual(captured['cmd'][-3:], ['-c', 'copy', 'out.mp3'])
+        self.assertEqual(
+            captured['list'],
+            "file '/tmp/a.mp3'\nfile '/tmp/it'\\''s.mp3'\n"
+        )
+
+
 class TestTTSProviderIntegration(unittest.TestCase):
     """Integration tests for TTS providers (requires actual API keys)"""
     